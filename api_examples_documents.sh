@@ -23,8 +23,25 @@ echo "3. Get a document by ID:"
 curl "$BASE_URL/drive/documents/$SAMPLE_DOCUMENT_ID"
 echo -e "\n---"
 
+# Get a document as plain text
+echo "4. Get a document as plain text:"
+curl "$BASE_URL/drive/documents/$SAMPLE_DOCUMENT_ID/text"
+echo -e "\n---"
+
+# Get a document as Markdown
+echo "5. Get a document as Markdown:"
+curl "$BASE_URL/drive/documents/$SAMPLE_DOCUMENT_ID/markdown"
+echo -e "\n---"
+
+# Edit a document
+echo "6. Edit a document:"
+curl -X POST "$BASE_URL/drive/documents/$SAMPLE_DOCUMENT_ID/edits" \
+  -H "Content-Type: application/json" \
+  -d '{"operations": [{"type": "insert", "index": 1, "text": "Hello "}, {"type": "insert", "index": 7, "text": "world"}]}'
+echo -e "\n---"
+
 # Delete a document by ID
-echo "4. Delete a document by ID:"
+echo "7. Delete a document by ID:"
 curl -X DELETE "$BASE_URL/drive/documents/$SAMPLE_DOCUMENT_ID"
 echo -e "\n---"
 
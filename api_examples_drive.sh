@@ -73,8 +73,20 @@ echo "9. Delete a comment:"
 curl -b "$SESSION_COOKIE" -X DELETE "$BASE_URL/drive/$SAMPLE_DOCUMENT_ID/comment/COMMENT_ID"
 echo -e "\n---"
 
+# List every comment modified since a point in time
+echo "10. List every comment modified since a point in time:"
+curl -b "$SESSION_COOKIE" "$BASE_URL/drive/$SAMPLE_DOCUMENT_ID/comment?allPages=true&pageSize=100&startModifiedTime=2024-01-01T00:00:00Z"
+echo -e "\n---"
+
+# Query comments of many files at once
+echo "11. Query comments of many files at once:"
+curl -b "$SESSION_COOKIE" -X POST "$BASE_URL/drive/comments:query" \
+  -H "Content-Type: application/json" \
+  -d "{\"fileIds\": [\"$SAMPLE_DOCUMENT_ID\"]}"
+echo -e "\n---"
+
 # Delete an object by ID
-echo "10. Delete an object by ID:"
+echo "12. Delete an object by ID:"
 curl -b "$SESSION_COOKIE" -X DELETE "$BASE_URL/drive/your_file_or_folder_id_here"
 echo -e "\n---"
 
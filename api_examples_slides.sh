@@ -0,0 +1,32 @@
+#!/bin/bash
+# Example usage of the Google Slides API Wrapper endpoints
+
+BASE_URL="http://localhost:8000"
+SAMPLE_PRESENTATION_ID="17rCbrfnQiFBWqHQCOJ5U7bug05C5XF9c4o4ptRrrOHY"  # Sample slide id from wrapper_api.md
+
+echo "=== Google Slides API Examples ==="
+echo
+
+# Get presentation metadata and slide ids
+echo "1. Get presentation metadata and slide ids:"
+curl "$BASE_URL/drive/slides/$SAMPLE_PRESENTATION_ID"
+echo -e "\n---"
+
+# Get the whole presentation
+echo "2. Get the whole presentation:"
+curl "$BASE_URL/drive/slides/$SAMPLE_PRESENTATION_ID?fields=*"
+echo -e "\n---"
+
+# Get a single page
+echo "3. Get a single page:"
+curl "$BASE_URL/drive/slides/$SAMPLE_PRESENTATION_ID/pages/p"
+echo -e "\n---"
+
+# Get thumbnails of all slides
+echo "4. Get thumbnails of all slides:"
+curl -N -X POST -H "Content-Type: application/json" \
+  -d '{"size": "SMALL"}' \
+  "$BASE_URL/drive/slides/$SAMPLE_PRESENTATION_ID/thumbnails"
+echo -e "\n---"
+
+echo "=== All examples completed ==="
@@ -76,4 +76,11 @@ echo "12. Delete a range from a sheet using A1 notation:"
 curl -X DELETE "$BASE_URL/drive/spreadsheets/$SAMPLE_SPREADSHEET_ID/sheets/Sheet1/range?a1=A1:B2"
 echo -e "\n---"
 
+# Query the rows of a sheet matching column predicates
+echo "13. Query the rows of a sheet matching column predicates:"
+curl -X POST -H "Content-Type: application/json" \
+  -d '{"where": [{"column": "Score", "op": "ge", "value": 90}], "select": ["Name", "Score"], "limit": 10}' \
+  "$BASE_URL/drive/spreadsheets/$SAMPLE_SPREADSHEET_ID/sheets/Sheet1/query"
+echo -e "\n---"
+
 echo "=== All examples completed ===" 
\ No newline at end of file
@@ -3,6 +3,7 @@ from fastapi.responses import RedirectResponse
 from google_auth_oauthlib.flow import Flow
 
 from config import settings
+from google_services import fetch_user_id
 
 router = APIRouter()
 
@@ -36,5 +37,7 @@ async def callback(request: Request):
         'client_secret': credentials.client_secret,
         'scopes': credentials.scopes
     }
+    # Per-user state is keyed by the account id: the refresh token is often absent on re-login
+    request.session['user_id'] = fetch_user_id(credentials, credentials.id_token)
     
     return RedirectResponse(url='/drive/search')
@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from .dataset import build_dataset
+from .fake_google import FakeGoogleBackend
+from .runner import format_results, run_scenarios
+from .scenarios import SUITES
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m bench",
+        description="Benchmark the wrapper routers in-process against a local fake Google backend.",
+    )
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Clients in flight per scenario")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed upstream latency per Google call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra upstream latency per call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of Google calls failing with 5xx/429")
+    parser.add_argument("--depth", type=int, default=4, help="Folder tree depth")
+    parser.add_argument("--fanout", type=int, default=4, help="Subfolders per folder")
+    parser.add_argument("--files-per-folder", type=int, default=20)
+    parser.add_argument("--sheet-rows", type=int, default=100_000)
+    parser.add_argument("--sheet-cols", type=int, default=8)
+    parser.add_argument("--doc-paragraphs", type=int, default=5_000)
+    parser.add_argument("--comments", type=int, default=200, help="Comments on the benchmark document")
+    parser.add_argument("--commented-files", type=int, default=50, help="Files with comments for the comments query")
+    parser.add_argument("--slides", type=int, default=200, help="Slides in the benchmark presentation")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="default", help="Scenario set to run")
+    parser.add_argument("--router", action="append", help="Only run scenarios for this router (repeatable)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", dest="json_path", help="Also write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    dataset = build_dataset(
+        depth=args.depth,
+        fanout=args.fanout,
+        files_per_folder=args.files_per_folder,
+        sheet_rows=args.sheet_rows,
+        sheet_cols=args.sheet_cols,
+        doc_paragraphs=args.doc_paragraphs,
+        comments_per_file=args.comments,
+        commented_files=args.commented_files,
+        slides=args.slides,
+        seed=args.seed,
+    )
+    backend = FakeGoogleBackend(
+        dataset,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    scenarios = SUITES[args.suite](dataset, args.requests, args.concurrency, backend=backend)
+    if args.router:
+        scenarios = [s for s in scenarios if s.router in args.router]
+
+    results = asyncio.run(run_scenarios(backend, scenarios))
+    print(format_results(results))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump([r.as_dict() for r in results], f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
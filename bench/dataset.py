@@ -0,0 +1,262 @@
+import random
+import string
+from typing import Dict, List
+
+FOLDER_MIME = "application/vnd.google-apps.folder"
+DOCUMENT_MIME = "application/vnd.google-apps.document"
+SPREADSHEET_MIME = "application/vnd.google-apps.spreadsheet"
+PRESENTATION_MIME = "application/vnd.google-apps.presentation"
+
+MODIFIED_TIME = "2025-08-02T14:00:50.229Z"
+
+
+class Dataset:
+    """
+    In-memory state served by the fake Google backend.
+
+    Holds a Drive folder tree, spreadsheet values, documents, presentations and comments. All
+    ids are deterministic so benchmark scenarios can address them directly.
+    """
+
+    def __init__(self):
+        self.files: Dict[str, dict] = {}
+        self.children: Dict[str, List[str]] = {"root": []}
+        self.spreadsheets: Dict[str, dict] = {}
+        self.values: Dict[str, Dict[str, List[list]]] = {}
+        self.documents: Dict[str, dict] = {}
+        self.presentations: Dict[str, dict] = {}
+        self.comments: Dict[str, List[dict]] = {}
+        self.folder_paths: List[str] = []
+        self.folder_ids: Dict[str, str] = {}
+        self.spreadsheet_id: str = None
+        self.document_id: str = None
+        self.presentation_id: str = None
+        self.commented_file_ids: List[str] = []
+        self.sequence = 0
+
+    def next_id(self, prefix: str) -> str:
+        self.sequence += 1
+        return f"{prefix}{self.sequence:08d}"
+
+    def add_file(self, name: str, mime_type: str, parent: str = "root", file_id: str = None) -> dict:
+        file_id = file_id or self.next_id("f")
+        item = {
+            "id": file_id,
+            "name": name,
+            "mimeType": mime_type,
+            "parents": [parent],
+            "modifiedTime": MODIFIED_TIME,
+        }
+        self.files[file_id] = item
+        self.children.setdefault(parent, []).append(file_id)
+        if mime_type == FOLDER_MIME:
+            self.children.setdefault(file_id, [])
+        return item
+
+    def remove_file(self, file_id: str) -> None:
+        item = self.files.pop(file_id)
+        for parent in item.get("parents", []):
+            siblings = self.children.get(parent, [])
+            if file_id in siblings:
+                siblings.remove(file_id)
+        self.spreadsheets.pop(file_id, None)
+        self.values.pop(file_id, None)
+        self.documents.pop(file_id, None)
+        self.presentations.pop(file_id, None)
+        self.comments.pop(file_id, None)
+
+
+def build_folder_tree(dataset: Dataset, depth: int, fanout: int, files_per_folder: int) -> None:
+    """Creates `fanout` subfolders per level down to `depth`, each holding plain files."""
+    level = [("root", "")]
+    for d in range(depth):
+        next_level = []
+        for parent_id, parent_path in level:
+            for i in range(files_per_folder):
+                dataset.add_file(f"file-{d}-{i}.txt", "text/plain", parent_id)
+            for i in range(fanout):
+                name = f"folder-{d}-{i}"
+                folder = dataset.add_file(name, FOLDER_MIME, parent_id)
+                path = f"{parent_path}/{name}"
+                dataset.folder_paths.append(path)
+                dataset.folder_ids[path] = folder["id"]
+                next_level.append((folder["id"], path))
+        level = next_level
+
+
+def build_spreadsheet(dataset: Dataset, rows: int, cols: int, rng: random.Random, title: str = "Bench Sheet") -> str:
+    """Creates a spreadsheet with one header row and `rows` data rows on 'Sheet1'."""
+    item = dataset.add_file(title, SPREADSHEET_MIME)
+    spreadsheet_id = item["id"]
+    header = [f"col{c}" for c in range(cols)]
+    header[0] = "id"
+    if cols > 1:
+        header[1] = "status"
+    statuses = ["open", "closed", "pending", "review"]
+    data = [header]
+    for r in range(rows):
+        row = [str(r)]
+        if cols > 1:
+            row.append(statuses[r % len(statuses)])
+        row.extend(str(rng.randint(0, 10_000)) for _ in range(cols - 2))
+        data.append(row)
+    dataset.values[spreadsheet_id] = {"Sheet1": data}
+    dataset.spreadsheets[spreadsheet_id] = {
+        "spreadsheetId": spreadsheet_id,
+        "properties": {"title": title},
+        "sheets": [
+            {"properties": {
+                "sheetId": 0,
+                "title": "Sheet1",
+                "index": 0,
+                "sheetType": "GRID",
+                "gridProperties": {"rowCount": rows + 1, "columnCount": cols},
+            }}
+        ],
+    }
+    return spreadsheet_id
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9)))
+        for _ in range(count)
+    )
+
+
+def _paragraph(index: int, text: str, style: str = "NORMAL_TEXT", bullet: bool = False, bold: bool = False) -> dict:
+    length = len(text.encode("utf-16-le")) // 2
+    run = {"content": text, "textStyle": {"bold": True} if bold else {}}
+    paragraph = {
+        "elements": [{"startIndex": index, "endIndex": index + length, "textRun": run}],
+        "paragraphStyle": {"namedStyleType": style},
+    }
+    if bullet:
+        paragraph["bullet"] = {"listId": "kix.list0"}
+    return {"startIndex": index, "endIndex": index + length, "paragraph": paragraph}
+
+
+def build_document(dataset: Dataset, paragraphs: int, rng: random.Random, title: str = "Bench Document") -> str:
+    """Creates a Docs structural document mixing headings, body text, bullets and small tables."""
+    item = dataset.add_file(title, DOCUMENT_MIME)
+    document_id = item["id"]
+    content = [{"endIndex": 1, "sectionBreak": {"sectionStyle": {}}}]
+    index = 1
+    for p in range(paragraphs):
+        if p % 50 == 0:
+            element = _paragraph(index, f"Section {p // 50}\n", style="HEADING_1")
+        elif p % 7 == 0:
+            element = _paragraph(index, _words(rng, 6) + "\n", bullet=True)
+        elif p % 97 == 0:
+            cells = []
+            start = index
+            index += 1
+            for r in range(2):
+                row_cells = []
+                for c in range(2):
+                    cell_para = _paragraph(index + 1, f"r{r}c{c}\n")
+                    row_cells.append({
+                        "startIndex": index,
+                        "endIndex": cell_para["endIndex"],
+                        "content": [cell_para],
+                    })
+                    index = cell_para["endIndex"]
+                cells.append({"tableCells": row_cells})
+            content.append({
+                "startIndex": start,
+                "endIndex": index + 1,
+                "table": {"rows": 2, "columns": 2, "tableRows": cells},
+            })
+            index += 1
+            continue
+        else:
+            element = _paragraph(index, _words(rng, rng.randint(20, 60)) + "\n", bold=p % 11 == 0)
+        content.append(element)
+        index = element["endIndex"]
+    dataset.documents[document_id] = {
+        "documentId": document_id,
+        "title": title,
+        "revisionId": "rev-1",
+        "body": {"content": content},
+        "lists": {"kix.list0": {"listProperties": {"nestingLevels": [{"glyphSymbol": "-"}]}}},
+    }
+    return document_id
+
+
+def build_presentation(dataset: Dataset, slides: int, rng: random.Random, title: str = "Bench Deck") -> str:
+    """Creates a presentation whose slides each hold a title and a body text box."""
+    item = dataset.add_file(title, PRESENTATION_MIME)
+    presentation_id = item["id"]
+    pages = []
+    for s in range(slides):
+        elements = []
+        for name, text in (("title", f"Slide {s}\n"), ("body", _words(rng, 40) + "\n")):
+            elements.append({
+                "objectId": f"s{s}_{name}",
+                "size": {"width": {"magnitude": 8000000, "unit": "EMU"}, "height": {"magnitude": 1000000, "unit": "EMU"}},
+                "shape": {
+                    "shapeType": "TEXT_BOX",
+                    "text": {"textElements": [{"startIndex": 0, "endIndex": len(text), "textRun": {"content": text, "style": {}}}]},
+                },
+            })
+        pages.append({
+            "objectId": f"s{s}",
+            "pageType": "SLIDE",
+            "pageElements": elements,
+            "slideProperties": {"layoutObjectId": "layout0", "masterObjectId": "master0"},
+        })
+    dataset.presentations[presentation_id] = {
+        "presentationId": presentation_id,
+        "title": title,
+        "revisionId": "rev-1",
+        "locale": "en",
+        "pageSize": {"width": {"magnitude": 9144000, "unit": "EMU"}, "height": {"magnitude": 5143500, "unit": "EMU"}},
+        "slides": pages,
+        "layouts": [{"objectId": "layout0", "pageType": "LAYOUT"}],
+        "masters": [{"objectId": "master0", "pageType": "MASTER"}],
+    }
+    return presentation_id
+
+
+def build_comments(dataset: Dataset, file_id: str, count: int, rng: random.Random) -> None:
+    comments = []
+    for c in range(count):
+        comments.append({
+            "kind": "drive#comment",
+            "id": f"c{c:06d}",
+            "createdTime": MODIFIED_TIME,
+            "modifiedTime": MODIFIED_TIME,
+            "author": {"displayName": "Bench User", "kind": "drive#user", "me": True},
+            "content": _words(rng, 12),
+            "htmlContent": _words(rng, 12),
+            "deleted": False,
+            "resolved": c % 5 == 0,
+        })
+    dataset.comments[file_id] = comments
+
+
+def build_dataset(
+    depth: int = 4,
+    fanout: int = 4,
+    files_per_folder: int = 20,
+    sheet_rows: int = 100_000,
+    sheet_cols: int = 8,
+    doc_paragraphs: int = 5_000,
+    comments_per_file: int = 200,
+    commented_files: int = 50,
+    slides: int = 200,
+    seed: int = 1,
+) -> Dataset:
+    rng = random.Random(seed)
+    dataset = Dataset()
+    build_folder_tree(dataset, depth, fanout, files_per_folder)
+    dataset.spreadsheet_id = build_spreadsheet(dataset, sheet_rows, sheet_cols, rng)
+    dataset.document_id = build_document(dataset, doc_paragraphs, rng)
+    build_comments(dataset, dataset.document_id, comments_per_file, rng)
+    dataset.presentation_id = build_presentation(dataset, slides, rng)
+    reviews = dataset.add_file("reviews", FOLDER_MIME)
+    for i in range(commented_files):
+        item = dataset.add_file(f"review-{i}.txt", "text/plain", reviews["id"])
+        build_comments(dataset, item["id"], 30, rng)
+        dataset.commented_file_ids.append(item["id"])
+    return dataset
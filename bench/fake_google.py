@@ -0,0 +1,629 @@
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import httplib2
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build
+
+from .dataset import FOLDER_MIME, Dataset
+
+# (serviceName, version) pairs served by the fake, matching google_services.py
+SERVICES = [("drive", "v3"), ("docs", "v1"), ("sheets", "v4"), ("slides", "v1")]
+
+
+class FakeError(Exception):
+    """Raised by handlers to answer with a Google-style error payload."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Route:
+    def __init__(self, method_id: str, http_method: str, pattern: str):
+        self.method_id = method_id
+        self.http_method = http_method
+        self.literal_size = len(re.sub(r"\{[^}]+\}", "", pattern))
+        regex = re.escape(pattern)
+        regex = re.sub(r"\\\{\\\+(\w+)\\\}", r"(?P<\1>.+)", regex)
+        regex = re.sub(r"\\\{(\w+)\\\}", r"(?P<\1>[^/]+)", regex)
+        self.regex = re.compile(f"^{regex}$")
+
+
+def load_routes() -> List[Route]:
+    """
+    Builds the URL routing table from the static discovery documents bundled with
+    google-api-python-client, so the fake answers the exact URLs the client emits.
+    """
+    routes = []
+    for service, version in SERVICES:
+        doc = json.loads(discovery_cache.get_static_doc(service, version))
+        base = doc["rootUrl"] + doc["servicePath"]
+
+        def walk(resources):
+            for resource in resources.values():
+                for method in resource.get("methods", {}).values():
+                    routes.append(Route(method["id"], method["httpMethod"], base + method["path"]))
+                walk(resource.get("resources", {}))
+
+        walk(doc["resources"])
+    # Prefer the most specific template when several match (e.g. '{id}' vs '{id}:batchUpdate')
+    routes.sort(key=lambda r: r.literal_size, reverse=True)
+    return routes
+
+
+def parse_fields(fields: str) -> dict:
+    """Parses a partial-response field mask such as 'files(id,name),nextPageToken' into a tree."""
+    tree: dict = {}
+    stack = [tree]
+    name = ""
+
+    def add(key: str) -> None:
+        node = stack[-1]
+        parts = [p for p in key.strip().replace(".", "/").split("/") if p]
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        if parts:
+            node.setdefault(parts[-1], {})
+
+    for ch in fields:
+        if ch == "(":
+            parts = [p for p in name.strip().replace(".", "/").split("/") if p]
+            node = stack[-1]
+            for part in parts:
+                node = node.setdefault(part, {})
+            stack.append(node)
+            name = ""
+        elif ch == ")":
+            add(name)
+            stack.pop()
+            name = ""
+        elif ch == ",":
+            add(name)
+            name = ""
+        else:
+            name += ch
+    add(name)
+    return tree
+
+
+def _select(payload, tree: dict):
+    if not tree or "*" in tree:
+        return payload
+    if isinstance(payload, list):
+        return [_select(item, tree) for item in payload]
+    if not isinstance(payload, dict):
+        return payload
+    return {k: _select(v, tree[k]) for k, v in payload.items() if k in tree}
+
+
+def apply_fields(payload: dict, fields: Optional[str]) -> dict:
+    """Applies a partial-response field mask, including nested selections like 'slides(objectId)'."""
+    if not fields or not isinstance(payload, dict):
+        return payload
+    return _select(payload, parse_fields(fields))
+
+
+class FakeGoogleBackend:
+    """
+    Local stand-in for the Google REST endpoints used by the wrapper.
+
+    Requests are routed through the discovery documents to handlers keyed by
+    method id (e.g. 'drive.files.list'). Every call is counted, can be delayed by
+    `latency` seconds (plus up to `jitter`) and fails with a 5xx/429 at
+    `error_rate`. Calls without a handler answer 501 so gaps are visible.
+    """
+
+    def __init__(
+        self,
+        dataset: Dataset,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 1,
+    ):
+        self.dataset = dataset
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.routes = load_routes()
+        self.calls: Counter = Counter()
+        self.bytes_sent = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self.changes: List[dict] = []
+        self.channels: Dict[str, dict] = {}
+        # Called with (address, headers) for every push notification; must not block
+        self.notification_sink: Optional[Callable[[str, dict], None]] = None
+        self.handlers: Dict[str, Callable[..., dict]] = {
+            "drive.files.list": self.files_list,
+            "drive.files.get": self.files_get,
+            "drive.files.update": self.files_update,
+            "drive.files.delete": self.files_delete,
+            "drive.comments.list": self.comments_list,
+            "drive.comments.get": self.comments_get,
+            "drive.comments.create": self.comments_create,
+            "drive.comments.update": self.comments_update,
+            "drive.comments.delete": self.comments_delete,
+            "drive.replies.create": self.replies_create,
+            "drive.changes.getStartPageToken": self.changes_start_page_token,
+            "drive.changes.list": self.changes_list,
+            "drive.changes.watch": self.changes_watch,
+            "drive.channels.stop": self.channels_stop,
+            "docs.documents.get": self.documents_get,
+            "docs.documents.create": self.documents_create,
+            "docs.documents.batchUpdate": self.documents_batch_update,
+            "sheets.spreadsheets.get": self.spreadsheets_get,
+            "sheets.spreadsheets.create": self.spreadsheets_create,
+            "sheets.spreadsheets.batchUpdate": self.spreadsheets_batch_update,
+            "sheets.spreadsheets.values.get": self.values_get,
+            "sheets.spreadsheets.values.batchGet": self.values_batch_get,
+            "slides.presentations.get": self.presentations_get,
+            "slides.presentations.pages.get": self.pages_get,
+            "slides.presentations.pages.getThumbnail": self.pages_get_thumbnail,
+        }
+
+    # -- transport -----------------------------------------------------------
+
+    def http(self) -> "FakeHttp":
+        return FakeHttp(self)
+
+    def build(self, service: str, version: str):
+        """Builds a googleapiclient service object whose transport is this backend."""
+        return build(service, version, http=self.http(), static_discovery=True)
+
+    def handle(self, uri: str, method: str, body: Optional[bytes], headers: Optional[dict]) -> Tuple[int, bytes]:
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        parts = urlsplit(uri)
+        query = parse_qs(parts.query)
+        override = headers.get("x-http-method-override")
+        if override:
+            # googleapiclient turns long GET URLs into POSTs with the query in the body
+            method = override
+            query.update(parse_qs(body.decode() if isinstance(body, bytes) else body or ""))
+            body = None
+        # Repeated parameters such as values.batchGet's ranges stay lists
+        params = {k: v[0] if len(v) == 1 else v for k, v in query.items()}
+        url = f"{parts.scheme}://{parts.netloc}{parts.path}"
+        route, path_params = self.resolve(method, url)
+        if route is None:
+            return self._error(404, f"No route for {method} {url}")
+        params.update(path_params)
+        payload = json.loads(body) if body else None
+
+        with self._lock:
+            self.calls[route.method_id] += 1
+        delay = self.latency + (self._rng.random() * self.jitter if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            return self._error(self._rng.choice([500, 503, 429]), "Injected failure")
+
+        handler = self.handlers.get(route.method_id)
+        if handler is None:
+            return self._error(501, f"{route.method_id} is not implemented by the fake backend")
+        try:
+            with self._lock:
+                result = handler(params, payload)
+        except FakeError as e:
+            return self._error(e.status, e.message)
+        content = json.dumps(apply_fields(result, params.get("fields"))).encode()
+        with self._lock:
+            self.bytes_sent += len(content)
+        return 200, content
+
+    def resolve(self, method: str, url: str) -> Tuple[Optional[Route], dict]:
+        for route in self.routes:
+            if route.http_method != method:
+                continue
+            match = route.regex.match(url)
+            if match:
+                return route, {k: unquote(v) for k, v in match.groupdict().items()}
+        return None, {}
+
+    def _error(self, status: int, message: str) -> Tuple[int, bytes]:
+        payload = {"error": {"code": status, "message": message, "errors": [{"message": message}]}}
+        return status, json.dumps(payload).encode()
+
+    # -- out-of-band changes ---------------------------------------------------
+
+    def record_change(self, file_id: str, removed: bool = False) -> None:
+        """Appends to the changes log and posts a notification to every live channel."""
+        with self._lock:
+            item = self.dataset.files.get(file_id, {})
+            self.changes.append({
+                "kind": "drive#change",
+                "changeType": "file",
+                "fileId": file_id,
+                "removed": removed,
+                "file": {"id": file_id, "parents": list(item.get("parents", []))},
+            })
+            now = time.time() * 1000
+            for channel in list(self.channels.values()):
+                if channel["expiration"] <= now:
+                    continue
+                channel["messages"] += 1
+                self._post(channel, "change")
+
+    def _post(self, channel: dict, state: str) -> None:
+        if self.notification_sink is None:
+            return
+        headers = {
+            "X-Goog-Channel-ID": channel["id"],
+            "X-Goog-Resource-ID": channel["resourceId"],
+            "X-Goog-Resource-State": state,
+            "X-Goog-Message-Number": str(channel["messages"]),
+        }
+        if channel.get("token"):
+            headers["X-Goog-Channel-Token"] = channel["token"]
+        self.notification_sink(channel["address"], headers)
+
+    def touch(self, file_id: str) -> None:
+        """Simulates another client editing a file."""
+        with self._lock:
+            document = self.dataset.documents.get(file_id)
+            if document is not None:
+                document["revisionId"] = f"rev-{int(document['revisionId'].rsplit('-', 1)[1]) + 1}"
+        self.record_change(file_id)
+
+    def add_file(self, name: str, mime_type: str, parent: str) -> dict:
+        """Simulates another client creating a file."""
+        with self._lock:
+            item = self.dataset.add_file(name, mime_type, parent)
+        self.record_change(item["id"])
+        return item
+
+    # -- drive ---------------------------------------------------------------
+
+    def _file(self, file_id: str) -> dict:
+        if file_id == "root":
+            return {"id": "root", "name": "My Drive", "mimeType": FOLDER_MIME, "parents": []}
+        item = self.dataset.files.get(file_id)
+        if item is None:
+            raise FakeError(404, f"File not found: {file_id}")
+        return item
+
+    def _matches(self, item: dict, clauses: List[tuple]) -> bool:
+        for field, op, value in clauses:
+            if field == "parents":
+                if value not in item.get("parents", []):
+                    return False
+            elif op == "contains":
+                if value.lower() not in item.get(field, "").lower():
+                    return False
+            elif op == "=":
+                if item.get(field) != value:
+                    return False
+            elif op == "!=":
+                if item.get(field) == value:
+                    return False
+        return True
+
+    def _parse_q(self, q: Optional[str]) -> List[tuple]:
+        clauses = []
+        for clause in re.split(r"\s+and\s+", q or ""):
+            clause = clause.strip()
+            if not clause or clause.startswith("trashed"):
+                continue
+            m = re.match(r"^'([^']*)' in parents$", clause)
+            if m:
+                clauses.append(("parents", "in", m.group(1)))
+                continue
+            m = re.match(r"^(\w+)\s*(=|!=|contains)\s*'([^']*)'$", clause)
+            if not m:
+                raise FakeError(400, f"Invalid query clause: {clause}")
+            clauses.append(m.groups())
+        return clauses
+
+    def _page(self, items: list, params: dict, default_size: int, max_size: int) -> Tuple[list, Optional[str]]:
+        size = min(int(params.get("pageSize", default_size)), max_size)
+        start = int(params.get("pageToken", 0))
+        end = start + size
+        return items[start:end], str(end) if end < len(items) else None
+
+    def files_list(self, params, body):
+        clauses = self._parse_q(params.get("q"))
+        parents = [c[2] for c in clauses if c[0] == "parents"]
+        if parents:
+            candidates = (self.dataset.files[i] for i in self.dataset.children.get(parents[0], []))
+        else:
+            candidates = self.dataset.files.values()
+        items = [f for f in candidates if self._matches(f, clauses)]
+        page, token = self._page(items, params, 100, 1000)
+        result = {"kind": "drive#fileList", "files": page}
+        if token:
+            result["nextPageToken"] = token
+        return result
+
+    def files_get(self, params, body):
+        return self._file(params["fileId"])
+
+    def files_update(self, params, body):
+        item = self._file(params["fileId"])
+        for parent in filter(None, params.get("addParents", "").split(",")):
+            item["parents"].append(parent)
+            self.dataset.children.setdefault(parent, []).append(item["id"])
+        if body and "name" in body:
+            item["name"] = body["name"]
+        self.record_change(item["id"])
+        return item
+
+    # -- changes -------------------------------------------------------------
+
+    def changes_start_page_token(self, params, body):
+        return {"kind": "drive#startPageToken", "startPageToken": str(len(self.changes) + 1)}
+
+    def changes_list(self, params, body):
+        start = int(params["pageToken"]) - 1
+        size = min(int(params.get("pageSize", 100)), 1000)
+        page = self.changes[start:start + size]
+        result = {"kind": "drive#changeList", "changes": page}
+        if start + size < len(self.changes):
+            result["nextPageToken"] = str(start + size + 1)
+        else:
+            result["newStartPageToken"] = str(len(self.changes) + 1)
+        return result
+
+    def changes_watch(self, params, body):
+        body = body or {}
+        if body.get("type") != "web_hook" or not body.get("address"):
+            raise FakeError(400, "A web_hook channel with an address is required")
+        channel = {
+            "id": body["id"],
+            "token": body.get("token"),
+            "address": body["address"],
+            "resourceId": self.dataset.next_id("res"),
+            "expiration": int(body.get("expiration") or (time.time() + 3600) * 1000),
+            "messages": 1,
+        }
+        self.channels[channel["id"]] = channel
+        self._post(channel, "sync")
+        return {
+            "kind": "api#channel",
+            "id": channel["id"],
+            "resourceId": channel["resourceId"],
+            "resourceUri": "https://www.googleapis.com/drive/v3/changes",
+            "expiration": str(channel["expiration"]),
+        }
+
+    def channels_stop(self, params, body):
+        channel = self.channels.get((body or {}).get("id"))
+        if channel is None or channel["resourceId"] != body.get("resourceId"):
+            raise FakeError(404, "Channel not found")
+        del self.channels[channel["id"]]
+        return {}
+
+    def files_delete(self, params, body):
+        item = self._file(params["fileId"])
+        self.record_change(item["id"], removed=True)
+        self.dataset.remove_file(params["fileId"])
+        return {}
+
+    # -- comments ------------------------------------------------------------
+
+    def _comments(self, file_id: str) -> List[dict]:
+        self._file(file_id)
+        return self.dataset.comments.setdefault(file_id, [])
+
+    def _comment(self, file_id: str, comment_id: str) -> dict:
+        for comment in self._comments(file_id):
+            if comment["id"] == comment_id:
+                return comment
+        raise FakeError(404, f"Comment not found: {comment_id}")
+
+    def comments_list(self, params, body):
+        comments = self._comments(params["fileId"])
+        if params.get("includeDeleted", "false") != "true":
+            comments = [c for c in comments if not c.get("deleted")]
+        since = params.get("startModifiedTime")
+        if since:
+            comments = [c for c in comments if c["modifiedTime"] >= since]
+        page, token = self._page(comments, params, 20, 100)
+        result = {"kind": "drive#commentList", "comments": page}
+        if token:
+            result["nextPageToken"] = token
+        return result
+
+    def comments_get(self, params, body):
+        return self._comment(params["fileId"], params["commentId"])
+
+    def comments_create(self, params, body):
+        comments = self._comments(params["fileId"])
+        comment = {
+            "kind": "drive#comment",
+            "id": self.dataset.next_id("c"),
+            "createdTime": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime()),
+            "author": {"displayName": "Bench User", "kind": "drive#user", "me": True},
+            "deleted": False,
+            "resolved": False,
+            **(body or {}),
+        }
+        comment["modifiedTime"] = comment["createdTime"]
+        comments.append(comment)
+        self.record_change(params["fileId"])
+        return comment
+
+    def comments_update(self, params, body):
+        comment = self._comment(params["fileId"], params["commentId"])
+        comment.update(body or {})
+        return comment
+
+    def comments_delete(self, params, body):
+        comment = self._comment(params["fileId"], params["commentId"])
+        comment["deleted"] = True
+        return {}
+
+    def replies_create(self, params, body):
+        comment = self._comment(params["fileId"], params["commentId"])
+        reply = {"kind": "drive#reply", "id": self.dataset.next_id("r"), **(body or {})}
+        comment.setdefault("replies", []).append(reply)
+        return reply
+
+    # -- docs ----------------------------------------------------------------
+
+    def _document(self, document_id: str) -> dict:
+        document = self.dataset.documents.get(document_id)
+        if document is None:
+            raise FakeError(404, f"Document not found: {document_id}")
+        return document
+
+    def documents_get(self, params, body):
+        return self._document(params["documentId"])
+
+    def documents_create(self, params, body):
+        title = (body or {}).get("title", "Untitled document")
+        item = self.dataset.add_file(title, "application/vnd.google-apps.document")
+        document = {
+            "documentId": item["id"],
+            "title": title,
+            "revisionId": "rev-1",
+            "body": {"content": [{"endIndex": 1, "sectionBreak": {"sectionStyle": {}}}]},
+        }
+        self.dataset.documents[item["id"]] = document
+        return document
+
+    def documents_batch_update(self, params, body):
+        document = self._document(params["documentId"])
+        required = (body or {}).get("writeControl", {}).get("requiredRevisionId")
+        if required and required != document["revisionId"]:
+            raise FakeError(400, "The document revision does not match the required revision")
+        revision = int(document["revisionId"].rsplit("-", 1)[1]) + 1
+        document["revisionId"] = f"rev-{revision}"
+        self.record_change(document["documentId"])
+        requests = (body or {}).get("requests", [])
+        return {
+            "documentId": document["documentId"],
+            "replies": [{} for _ in requests],
+            "writeControl": {"requiredRevisionId": document["revisionId"]},
+        }
+
+    # -- sheets --------------------------------------------------------------
+
+    def _spreadsheet(self, spreadsheet_id: str) -> dict:
+        spreadsheet = self.dataset.spreadsheets.get(spreadsheet_id)
+        if spreadsheet is None:
+            raise FakeError(404, f"Spreadsheet not found: {spreadsheet_id}")
+        return spreadsheet
+
+    def spreadsheets_get(self, params, body):
+        return self._spreadsheet(params["spreadsheetId"])
+
+    def spreadsheets_create(self, params, body):
+        title = (body or {}).get("properties", {}).get("title", "Untitled spreadsheet")
+        item = self.dataset.add_file(title, "application/vnd.google-apps.spreadsheet")
+        spreadsheet = {
+            "spreadsheetId": item["id"],
+            "properties": {"title": title},
+            "sheets": [{"properties": {"sheetId": 0, "title": "Sheet1", "index": 0}}],
+        }
+        self.dataset.spreadsheets[item["id"]] = spreadsheet
+        self.dataset.values[item["id"]] = {"Sheet1": []}
+        return spreadsheet
+
+    def spreadsheets_batch_update(self, params, body):
+        spreadsheet = self._spreadsheet(params["spreadsheetId"])
+        requests = (body or {}).get("requests", [])
+        self.record_change(spreadsheet["spreadsheetId"])
+        return {"spreadsheetId": spreadsheet["spreadsheetId"], "replies": [{} for _ in requests]}
+
+    def values_get(self, params, body):
+        return self._value_range(params["spreadsheetId"], params["range"])
+
+    def values_batch_get(self, params, body):
+        ranges = params.get("ranges", [])
+        if isinstance(ranges, str):
+            ranges = [ranges]
+        return {
+            "spreadsheetId": params["spreadsheetId"],
+            "valueRanges": [self._value_range(params["spreadsheetId"], a1) for a1 in ranges],
+        }
+
+    def _value_range(self, spreadsheet_id: str, a1: str) -> dict:
+        self._spreadsheet(spreadsheet_id)
+        title, _, cells = a1.rpartition("!")
+        if not title:
+            title, cells = cells, ""
+        rows = self.dataset.values[spreadsheet_id].get(title.strip("'"))
+        if rows is None:
+            raise FakeError(400, f"Unable to parse range: {a1}")
+        (r0, c0), (r1, c1) = parse_a1(cells)
+        window = [row[c0:c1] for row in rows[r0:r1]]
+        while window and not window[-1]:
+            window.pop()
+        result = {"range": a1, "majorDimension": "ROWS"}
+        if window:
+            result["values"] = window
+        return result
+
+    # -- slides --------------------------------------------------------------
+
+    def _presentation(self, presentation_id: str) -> dict:
+        presentation = self.dataset.presentations.get(presentation_id)
+        if presentation is None:
+            raise FakeError(404, f"Presentation not found: {presentation_id}")
+        return presentation
+
+    def presentations_get(self, params, body):
+        return self._presentation(params["presentationId"])
+
+    def pages_get(self, params, body):
+        presentation = self._presentation(params["presentationId"])
+        for page in presentation["slides"]:
+            if page["objectId"] == params["pageObjectId"]:
+                return page
+        raise FakeError(404, f"Page not found: {params['pageObjectId']}")
+
+    def pages_get_thumbnail(self, params, body):
+        page = self.pages_get(params, body)
+        width = {"SMALL": 200, "MEDIUM": 800, "LARGE": 1600}[params.get("thumbnailProperties.thumbnailSize", "MEDIUM")]
+        return {
+            "width": width,
+            "height": width * 9 // 16,
+            "contentUrl": f"https://thumbnails.bench.invalid/{params['presentationId']}/{page['objectId']}/{width}.png",
+        }
+
+
+def _column_index(col: str) -> int:
+    idx = 0
+    for c in col:
+        idx = idx * 26 + (ord(c.upper()) - ord("A") + 1)
+    return idx - 1
+
+
+def parse_a1(cells: str) -> Tuple[Tuple[int, int], Tuple[Optional[int], Optional[int]]]:
+    """Parses 'A1:B2', 'A:C', 'A2:C' or '' into zero-based, end-exclusive (row, col) bounds."""
+    if not cells:
+        return (0, 0), (None, None)
+    start, _, end = cells.partition(":")
+    end = end or start
+    m0 = re.match(r"^([A-Za-z]*)(\d*)$", start)
+    m1 = re.match(r"^([A-Za-z]*)(\d*)$", end)
+    if not m0 or not m1:
+        raise FakeError(400, f"Unable to parse range: {cells}")
+    c0 = _column_index(m0.group(1)) if m0.group(1) else 0
+    r0 = int(m0.group(2)) - 1 if m0.group(2) else 0
+    c1 = _column_index(m1.group(1)) + 1 if m1.group(1) else None
+    r1 = int(m1.group(2)) if m1.group(2) else None
+    return (r0, c0), (r1, c1)
+
+
+class FakeHttp:
+    """httplib2.Http-compatible transport that hands requests to a FakeGoogleBackend."""
+
+    def __init__(self, backend: FakeGoogleBackend):
+        self.backend = backend
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=1, connection_type=None):
+        status, content = self.backend.handle(uri, method, body, headers)
+        response = httplib2.Response({"status": str(status), "content-type": "application/json"})
+        return response, content
+
+    def close(self):
+        return None
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from .fake_google import FakeGoogleBackend
+
+# main.py reads these through config.Settings at import time
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("HOST", "localhost")
+os.environ.setdefault("PORT", "8000")
+
+
+@dataclass
+class Scenario:
+    """A single endpoint exercised `requests` times with `concurrency` clients in flight."""
+    name: str
+    router: str
+    method: str
+    path: str
+    json: Optional[dict] = None
+    requests: int = 100
+    concurrency: int = 8
+    # Cycled through in request order instead of `path` when given
+    paths: Optional[List[str]] = None
+    # Called before the run, e.g. to flip a settings flag; returns an undo callable
+    setup: Optional[Callable[[], Callable[[], None]]] = None
+    # Called with the request number before each request, e.g. to change data out of band
+    before_request: Optional[Callable[[int], None]] = None
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    router: str
+    requests: int
+    errors: int
+    seconds: float
+    latencies: List[float]
+    upstream_calls: Dict[str, int] = field(default_factory=dict)
+    response_bytes: int = 0
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "router": self.router,
+            "requests": self.requests,
+            "errors": self.errors,
+            "throughput_rps": round(self.throughput, 2),
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "upstream_calls": self.upstream_calls,
+            "upstream_calls_per_request": round(sum(self.upstream_calls.values()) / self.requests, 2) if self.requests else 0,
+            "response_bytes": self.response_bytes,
+        }
+
+
+def create_app(backend: FakeGoogleBackend):
+    """Returns the wrapper's FastAPI app with every Google service routed to `backend`."""
+    from google.oauth2.credentials import Credentials
+    from main import app
+    import google_services
+
+    app.dependency_overrides[google_services.get_credentials] = lambda: Credentials(token="bench-token")
+    app.dependency_overrides[google_services.get_user_key] = lambda: "bench-user"
+    app.dependency_overrides[google_services.get_user_key_resolver] = lambda: lambda: "bench-user"
+    app.dependency_overrides[google_services.get_drive_service] = lambda: backend.build("drive", "v3")
+    app.dependency_overrides[google_services.get_docs_service] = lambda: backend.build("docs", "v1")
+    app.dependency_overrides[google_services.get_sheets_service] = lambda: backend.build("sheets", "v4")
+    app.dependency_overrides[google_services.get_slides_service] = lambda: backend.build("slides", "v1")
+    return app
+
+
+async def run_scenario(client: httpx.AsyncClient, backend: FakeGoogleBackend, scenario: Scenario) -> ScenarioResult:
+    undo = scenario.setup() if scenario.setup else None
+    before = Counter(backend.calls)
+    latencies: List[float] = []
+    errors = 0
+    response_bytes = 0
+    remaining = iter(range(scenario.requests))
+
+    async def worker():
+        nonlocal errors, response_bytes
+        for i in remaining:
+            path = scenario.paths[i % len(scenario.paths)] if scenario.paths else scenario.path
+            if scenario.before_request:
+                scenario.before_request(i)
+            started = time.perf_counter()
+            response = await client.request(scenario.method, path, json=scenario.json)
+            body = await response.aread()
+            latencies.append(time.perf_counter() - started)
+            response_bytes += len(body)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker() for _ in range(scenario.concurrency)))
+    finally:
+        if undo:
+            undo()
+    seconds = time.perf_counter() - started
+    calls = Counter(backend.calls)
+    calls.subtract(before)
+    return ScenarioResult(
+        name=scenario.name,
+        router=scenario.router,
+        requests=scenario.requests,
+        errors=errors,
+        seconds=seconds,
+        latencies=latencies,
+        upstream_calls={k: v for k, v in calls.items() if v},
+        response_bytes=response_bytes,
+    )
+
+
+async def run_scenarios(backend: FakeGoogleBackend, scenarios: List[Scenario]) -> List[ScenarioResult]:
+    app = create_app(backend)
+    transport = httpx.ASGITransport(app=app)
+    results = []
+    notifications: asyncio.Queue = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+    backend.notification_sink = lambda address, headers: loop.call_soon_threadsafe(
+        notifications.put_nowait, (address, headers)
+    )
+
+    async def deliver_notifications(client: httpx.AsyncClient):
+        # Plays Google's part of a push channel: POST each notification to the channel address
+        while True:
+            address, headers = await notifications.get()
+            await client.post(urlsplit(address).path, headers=headers)
+
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            pump = asyncio.create_task(deliver_notifications(client))
+            try:
+                for scenario in scenarios:
+                    results.append(await run_scenario(client, backend, scenario))
+            finally:
+                pump.cancel()
+    finally:
+        backend.notification_sink = None
+        app.dependency_overrides.clear()
+    return results
+
+
+def format_results(results: List[ScenarioResult]) -> str:
+    header = f"{'scenario':<34} {'router':<13} {'req':>5} {'err':>4} {'rps':>9} {'p50 ms':>9} {'p99 ms':>9} {'up/req':>7} {'KB/req':>9}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        d = r.as_dict()
+        kb = r.response_bytes / r.requests / 1024 if r.requests else 0
+        lines.append(
+            f"{r.name:<34} {r.router:<13} {r.requests:>5} {r.errors:>4} {d['throughput_rps']:>9.1f} "
+            f"{d['p50_ms']:>9.2f} {d['p99_ms']:>9.2f} {d['upstream_calls_per_request']:>7.2f} {kb:>9.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,159 @@
+from typing import Callable, List
+
+from .dataset import Dataset
+from .runner import Scenario
+
+
+def with_setting(name: str, value) -> Callable[[], Callable[[], None]]:
+    """Scenario setup that overrides a config.settings field for the duration of the run."""
+    def setup():
+        from config import settings
+        previous = getattr(settings, name)
+        setattr(settings, name, value)
+        return lambda: setattr(settings, name, previous)
+    return setup
+
+
+def default_scenarios(dataset: Dataset, requests: int, concurrency: int, backend=None) -> List[Scenario]:
+    """One or more read-heavy scenarios per router, addressed at the generated dataset."""
+    deepest = max(dataset.folder_paths, key=lambda p: p.count("/"))
+    document_id = dataset.document_id
+    spreadsheet_id = dataset.spreadsheet_id
+    presentation_id = dataset.presentation_id
+    query_path = f"/drive/spreadsheets/{spreadsheet_id}/sheets/Sheet1/query"
+    # A rare status/value combination, so the scan reads the whole sheet
+    sheet_query = {
+        "where": [{"column": "status", "op": "eq", "value": "review"}, {"column": "col2", "op": "ge", "value": 9990}],
+        "select": ["id", "status", "col2"],
+    }
+
+    def scenario(name, router, method, path, **kwargs):
+        return Scenario(name, router, method, path, requests=requests, concurrency=concurrency, **kwargs)
+
+    return [
+        scenario("search name contains", "drive", "GET", "/drive/search?name=file-1"),
+        scenario("navigate root", "drive", "GET", "/drive/navigate/"),
+        scenario("navigate deepest folder", "drive", "GET", f"/drive/navigate{deepest}"),
+        scenario("get spreadsheet", "spreadsheets", "GET", f"/drive/spreadsheets/{spreadsheet_id}"),
+        scenario("get sheet", "spreadsheets", "GET", f"/drive/spreadsheets/{spreadsheet_id}/sheets/Sheet1"),
+        scenario("get range 1000 rows", "spreadsheets", "GET",
+                 f"/drive/spreadsheets/{spreadsheet_id}/sheets/Sheet1/range?a1=A1:H1000"),
+        scenario("query sheet, limit 50", "spreadsheets", "POST", query_path,
+                 json={"where": [{"column": "status", "op": "eq", "value": "open"}], "limit": 50}),
+        scenario("query sheet, full scan", "spreadsheets", "POST", query_path, json=sheet_query),
+        scenario("query sheet, indexed lookup", "spreadsheets", "POST", query_path,
+                 json={"where": [{"column": "id", "op": "in", "value": ["17", "4242", "90001"]}], "useIndex": True}),
+        scenario("get document", "documents", "GET", f"/drive/documents/{document_id}"),
+        scenario("document text", "documents", "GET", f"/drive/documents/{document_id}/text"),
+        scenario("document markdown", "documents", "GET", f"/drive/documents/{document_id}/markdown"),
+        scenario("keystroke edits", "documents", "POST", f"/drive/documents/{document_id}/edits",
+                 json={"operations": [{"type": "insert", "index": 1, "text": "a"}]}),
+        scenario("presentation metadata", "slides", "GET", f"/drive/slides/{presentation_id}"),
+        scenario("presentation page", "slides", "GET", f"/drive/slides/{presentation_id}/pages/s1"),
+        scenario("thumbnails of all slides", "slides", "POST", f"/drive/slides/{presentation_id}/thumbnails",
+                 json={"size": "SMALL"}),
+        scenario("list comments", "comments", "GET", f"/drive/{document_id}/comment"),
+        scenario("list all comment pages", "comments", "GET", f"/drive/{document_id}/comment?allPages=true&pageSize=100"),
+        scenario("query comments of many files", "comments", "POST", "/drive/comments:query",
+                 json={"fileIds": dataset.commented_file_ids}),
+        scenario("get comment", "comments", "GET", f"/drive/{document_id}/comment/c000001"),
+        scenario("add comment", "comments", "POST", f"/drive/{document_id}/comment",
+                 json={"content": "bench comment"}),
+    ]
+
+
+def fast_json_scenarios(dataset: Dataset, requests: int, concurrency: int, backend=None) -> List[Scenario]:
+    """The serialization-heavy scenarios, once on the default path and once with FAST_JSON."""
+    paths = [
+        ("search name contains", "drive", "/drive/search?name=file-1"),
+        ("navigate root", "drive", "/drive/navigate/"),
+        ("get range 1000 rows", "spreadsheets",
+         f"/drive/spreadsheets/{dataset.spreadsheet_id}/sheets/Sheet1/range?a1=A1:H1000"),
+        ("get document", "documents", f"/drive/documents/{dataset.document_id}"),
+    ]
+    scenarios = []
+    for name, router, path in paths:
+        for fast in (False, True):
+            scenarios.append(Scenario(
+                f"{name} [{'fast' if fast else 'default'}]", router, "GET", path,
+                requests=requests, concurrency=concurrency, setup=with_setting("FAST_JSON", fast),
+            ))
+    return scenarios
+
+
+def prefetch_scenarios(dataset: Dataset, requests: int, concurrency: int, backend=None) -> List[Scenario]:
+    """
+    A user browsing down the tree: each folder listing is followed by a click into one of its
+    subfolders. Run once without and once with child folder prefetch.
+    """
+    paths = [p for p in dataset.folder_paths if p.count("/") < max(p.count("/") for p in dataset.folder_paths)]
+    browse = []
+    for parent in paths:
+        browse.extend(["/drive/navigate" + parent, "/drive/navigate" + parent + "/folder-" + str(parent.count("/")) + "-0"])
+    scenarios = []
+    for enabled in (False, True):
+        scenarios.append(Scenario(
+            f"browse into subfolders [{'prefetch' if enabled else 'default'}]", "drive", "GET", browse[0],
+            paths=browse, requests=requests, concurrency=concurrency,
+            setup=with_setting("PREFETCH_CHILD_FOLDERS", enabled),
+        ))
+    return scenarios
+
+
+def changes_scenarios(dataset: Dataset, requests: int, concurrency: int, backend=None) -> List[Scenario]:
+    """
+    Browsing with prefetch while another client keeps adding files to the folders being
+    browsed. A changes watch is registered first, so each change is pushed back to the
+    wrapper and invalidates the stale prefetched listing.
+    """
+    browse = prefetch_scenarios(dataset, requests, concurrency)[1]
+    parents = [p for p in browse.paths if p.endswith("-0")]
+
+    def churn(i: int) -> None:
+        if i % 4 == 0:
+            path = parents[(i // 4) % len(parents)][len("/drive/navigate"):]
+            folder_id = dataset.folder_ids[path]
+            backend.add_file(f"churn-{i}.txt", "text/plain", folder_id)
+
+    address = "http://bench/drive/changes/notifications"
+    return [
+        Scenario("register changes watch", "changes", "POST", "/drive/changes/watch",
+                 requests=1, concurrency=1, setup=with_setting("CHANGES_WEBHOOK_ADDRESS", address)),
+        Scenario("browse with prefetch under churn", "drive", "GET", browse.path, paths=browse.paths,
+                 requests=requests, concurrency=concurrency, setup=browse.setup, before_request=churn),
+    ]
+
+
+def slides_scenarios(dataset: Dataset, requests: int, concurrency: int, backend=None) -> List[Scenario]:
+    """
+    Loading a deck: the whole presentation at once versus metadata plus one page, and
+    thumbnails of every slide with an empty and with a warm thumbnail cache.
+    """
+    base = f"/drive/slides/{dataset.presentation_id}"
+    slide_ids = [s["objectId"] for s in dataset.presentations[dataset.presentation_id]["slides"]]
+
+    def clear_thumbnails(i: int) -> None:
+        from drive.slides import thumbnail_cache
+        thumbnail_cache.clear()
+
+    def scenario(name, method, path, **kwargs):
+        return Scenario(name, "slides", method, path, requests=requests, concurrency=concurrency, **kwargs)
+
+    return [
+        scenario("whole presentation", "GET", f"{base}?fields=*"),
+        scenario("metadata only", "GET", base),
+        scenario("metadata then pages on demand", "GET", base,
+                 paths=[base] + [f"{base}/pages/{page_id}" for page_id in slide_ids[:3]]),
+        scenario("thumbnails, cold cache", "POST", f"{base}/thumbnails", json={"size": "SMALL"},
+                 before_request=clear_thumbnails),
+        scenario("thumbnails, warm cache", "POST", f"{base}/thumbnails", json={"size": "SMALL"}),
+    ]
+
+
+SUITES = {
+    "default": default_scenarios,
+    "fast-json": fast_json_scenarios,
+    "prefetch": prefetch_scenarios,
+    "changes": changes_scenarios,
+    "slides": slides_scenarios,
+}
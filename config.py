@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -5,6 +6,33 @@ class Settings(BaseSettings):
     HOST: str
     PORT: int
     CLIENT_SECRETS_FILE: str = "client_secret.json"
+    # Encode list and document responses directly (orjson when installed), skipping response_model validation
+    FAST_JSON: bool = False
+    # Seconds document edits are buffered per user and document before one batchUpdate is sent
+    DOCUMENT_EDIT_FLUSH_WINDOW: float = 0.1
+    # Files fetched at once by POST /drive/comments:query
+    COMMENTS_QUERY_CONCURRENCY: int = 8
+    # Speculative prefetch of child folder listings after /drive/navigate
+    PREFETCH_CHILD_FOLDERS: bool = False
+    PREFETCH_TTL: float = 30.0
+    PREFETCH_CONCURRENCY: int = 4
+    PREFETCH_MAX_FOLDERS: int = 20
+    PREFETCH_MAX_BYTES: int = 512 * 1024
+    PREFETCH_MAX_ENTRIES: int = 2048
+    # Drive changes tracking for cache invalidation; without a public HTTPS webhook address it polls
+    CHANGES_WEBHOOK_ADDRESS: Optional[str] = None
+    CHANGES_CHANNEL_TTL: int = 24 * 3600
+    CHANGES_RENEW_MARGIN: int = 600
+    CHANGES_POLL_INTERVAL: int = 60
+    CHANGES_MAINTENANCE_INTERVAL: int = 30
+    # POST /drive/spreadsheets/{id}/sheets/{name}/query: rows per read and the cached column indexes
+    SHEET_QUERY_WINDOW_ROWS: int = 1000
+    SHEET_QUERY_INDEX_TTL: float = 300.0
+    SHEET_QUERY_INDEX_MAX_ENTRIES: int = 64
+    # POST /drive/slides/{id}/thumbnails; Google's thumbnail URLs expire after 30 minutes
+    SLIDES_THUMBNAIL_CONCURRENCY: int = 8
+    SLIDES_THUMBNAIL_TTL: float = 25 * 60
+    SLIDES_THUMBNAIL_MAX_ENTRIES: int = 4096
     SCOPES: list[str] = [
         'https://www.googleapis.com/auth/userinfo.email',
         'https://www.googleapis.com/auth/userinfo.profile',
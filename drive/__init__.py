@@ -2,3 +2,5 @@ from .drive import router as drive_router
 from .spreadsheets import router as spreadsheets_router
 from .documents import router as documents_router
 from .comments import comments_router
+from .changes import router as changes_router
+from .slides import router as slides_router
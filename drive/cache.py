@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory LRU cache with optional per-entry expiry.
+
+    Entries can be tagged with the Drive file ids they were derived from, so that a
+    change to a file invalidates every entry built from it via `invalidate_file`.
+    `on_evict(key, value, reason)` is called when an entry leaves the cache for any
+    reason other than being overwritten; reason is one of 'expired', 'evicted',
+    'invalidated' or 'removed'.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: Optional[float] = None,
+        max_entries: int = 1024,
+        on_evict: Optional[Callable[[Hashable, Any, str], None]] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        register(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at, _ = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key, "expired")
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = (), ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at, frozenset(tags))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest, "evicted")
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return default
+            return self._remove(key, "removed")
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Drops every entry tagged with `tag` and returns how many were dropped."""
+        with self._lock:
+            keys = [k for k, (_, _, tags) in self._entries.items() if tag in tags]
+            for key in keys:
+                self._remove(key, "invalidated")
+            return len(keys)
+
+    def purge_expired(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            keys = [k for k, (_, expires_at, _) in self._entries.items() if expires_at is not None and expires_at <= now]
+            for key in keys:
+                self._remove(key, "expired")
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key, "removed")
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Hashable, reason: str) -> Any:
+        value, _, _ = self._entries.pop(key)
+        if self.on_evict:
+            self.on_evict(key, value, reason)
+        return value
+
+
+_caches: Dict[str, TTLCache] = {}
+
+
+def register(cache: TTLCache) -> None:
+    _caches[cache.name] = cache
+
+
+def get_cache(name: str) -> Optional[TTLCache]:
+    return _caches.get(name)
+
+
+def invalidate_file(file_id: str) -> int:
+    """Drops entries derived from `file_id` from every registered cache."""
+    return sum(cache.invalidate_tag(file_id) for cache in list(_caches.values()))
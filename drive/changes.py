@@ -0,0 +1,293 @@
+import asyncio
+import logging
+import secrets
+import time
+import uuid
+from typing import Dict, Optional, Set
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from googleapiclient.errors import HttpError
+
+from config import settings
+from google_services import execute_async, get_drive_service, get_user_key
+from .cache import invalidate_file
+
+logger = logging.getLogger(__name__)
+
+CHANGE_FIELDS = "nextPageToken,newStartPageToken,changes(fileId,removed,file(parents))"
+
+
+class Watch:
+    """Change tracking state of one user: the changes page token and the push channel, if any."""
+
+    def __init__(self, user_key: str, drive_service, page_token: str):
+        self.user_key = user_key
+        self.drive_service = drive_service
+        self.page_token = page_token
+        self.channel_id: Optional[str] = None
+        self.resource_id: Optional[str] = None
+        self.channel_token: Optional[str] = None
+        self.expiration: Optional[float] = None
+        self.last_sync = time.time()
+        self.syncing = False
+        self.dirty = False
+
+    @property
+    def mode(self) -> str:
+        return "push" if self.channel_id else "poll"
+
+    def as_dict(self) -> dict:
+        return {
+            "mode": self.mode,
+            "channelId": self.channel_id,
+            "expiration": int(self.expiration * 1000) if self.expiration else None,
+            "pageToken": self.page_token,
+        }
+
+
+class ChannelManager:
+    """
+    Keeps the wrapper's caches coherent with Drive using `changes().watch` push channels.
+
+    Each registered user gets a web_hook channel pointing at CHANGES_WEBHOOK_ADDRESS.
+    A notification triggers a `changes().list` from the saved page token and every
+    changed file, and its parent folders, is invalidated in all registered caches.
+    Channels are renewed CHANGES_RENEW_MARGIN seconds before they expire. If no
+    webhook address is configured, or a channel cannot be created or renewed, the
+    user falls back to polling `changes().list` every CHANGES_POLL_INTERVAL seconds.
+    """
+
+    def __init__(self):
+        self.watches: Dict[str, Watch] = {}
+        self.channels: Dict[str, Watch] = {}
+        self._maintenance: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        # One lock per user: concurrent watch calls and maintenance must not open two channels
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _lock(self, user_key: str) -> asyncio.Lock:
+        return self._locks.setdefault(user_key, asyncio.Lock())
+
+    async def register(self, user_key: str, drive_service) -> Watch:
+        async with self._lock(user_key):
+            watch = self.watches.get(user_key)
+            if watch is None:
+                result = await execute_async(drive_service.changes().getStartPageToken())
+                watch = Watch(user_key, drive_service, result["startPageToken"])
+                self.watches[user_key] = watch
+            else:
+                watch.drive_service = drive_service
+            if watch.channel_id is None:
+                self._attach(watch, await self._create_channel(watch))
+        self._ensure_maintenance()
+        return watch
+
+    async def unregister(self, user_key: str) -> None:
+        async with self._lock(user_key):
+            watch = self.watches.pop(user_key, None)
+            if watch is not None and watch.channel_id:
+                channel_id, resource_id = watch.channel_id, watch.resource_id
+                self._detach(watch)
+                await self._stop_channel(watch, channel_id, resource_id)
+
+    def notify(self, channel_id: str, channel_token: Optional[str], resource_state: str) -> bool:
+        """Handles a webhook notification. Returns False if it does not belong to a known channel."""
+        watch = self.channels.get(channel_id)
+        if watch is None or not secrets.compare_digest(watch.channel_token or "", channel_token or ""):
+            return False
+        if resource_state != "sync":
+            self._spawn(self.sync(watch))
+        return True
+
+    async def sync(self, watch: Watch) -> int:
+        """Lists changes since the saved page token and invalidates the affected cache entries."""
+        if watch.syncing:
+            watch.dirty = True
+            return 0
+        watch.syncing = True
+        invalidated = 0
+        try:
+            while True:
+                watch.dirty = False
+                page_token = watch.page_token
+                while page_token:
+                    result = await execute_async(watch.drive_service.changes().list(
+                        pageToken=page_token, pageSize=1000, includeRemoved=True, fields=CHANGE_FIELDS
+                    ))
+                    for change in result.get("changes", []):
+                        invalidated += self._invalidate(change)
+                    if "newStartPageToken" in result:
+                        watch.page_token = result["newStartPageToken"]
+                    page_token = result.get("nextPageToken")
+                watch.last_sync = time.time()
+                if not watch.dirty:
+                    return invalidated
+        finally:
+            watch.syncing = False
+
+    async def maintain(self) -> None:
+        """One maintenance pass: renew expiring channels, and poll users without a live channel."""
+        now = time.time()
+        for watch in list(self.watches.values()):
+            try:
+                async with self._lock(watch.user_key):
+                    await self._maintain_watch(watch, now)
+            except Exception:
+                # Expired credentials or transport errors of one user must not stop the others
+                logger.exception("Changes maintenance failed for a user")
+
+    async def _maintain_watch(self, watch: Watch, now: float) -> None:
+        if self.watches.get(watch.user_key) is not watch:
+            # Unregistered since this pass started
+            return
+        if watch.channel_id and watch.expiration <= now:
+            self._detach(watch)
+        if watch.channel_id and watch.expiration - now < settings.CHANGES_RENEW_MARGIN:
+            channel = await self._create_channel(watch)
+            if channel:
+                channel_id, resource_id = watch.channel_id, watch.resource_id
+                self._detach(watch)
+                self._attach(watch, channel)
+                await self._stop_channel(watch, channel_id, resource_id)
+        if watch.channel_id is None:
+            # Lapsed or never opened: catch up by polling, and retry push for the next pass
+            if now - watch.last_sync >= settings.CHANGES_POLL_INTERVAL:
+                await self.sync(watch)
+            self._attach(watch, await self._create_channel(watch))
+
+    def _invalidate(self, change: dict) -> int:
+        file_id = change.get("fileId")
+        if not file_id:
+            return 0
+        count = invalidate_file(file_id)
+        for parent in change.get("file", {}).get("parents", []):
+            count += invalidate_file(parent)
+        return count
+
+    async def _create_channel(self, watch: Watch) -> Optional[dict]:
+        if not settings.CHANGES_WEBHOOK_ADDRESS:
+            return None
+        body = {
+            "id": str(uuid.uuid4()),
+            "type": "web_hook",
+            "address": settings.CHANGES_WEBHOOK_ADDRESS,
+            "token": secrets.token_urlsafe(24),
+            "expiration": int((time.time() + settings.CHANGES_CHANNEL_TTL) * 1000),
+        }
+        try:
+            result = await execute_async(watch.drive_service.changes().watch(pageToken=watch.page_token, body=body))
+        except HttpError as e:
+            logger.warning("Could not open a changes channel, polling instead: %s", e)
+            return None
+        return {
+            "id": body["id"],
+            "token": body["token"],
+            "resourceId": result.get("resourceId"),
+            "expiration": int(result.get("expiration", body["expiration"])) / 1000,
+        }
+
+    def _attach(self, watch: Watch, channel: Optional[dict]) -> None:
+        if channel is None:
+            return
+        watch.channel_id = channel["id"]
+        watch.channel_token = channel["token"]
+        watch.resource_id = channel["resourceId"]
+        watch.expiration = channel["expiration"]
+        self.channels[channel["id"]] = watch
+
+    def _detach(self, watch: Watch) -> None:
+        self.channels.pop(watch.channel_id, None)
+        watch.channel_id = watch.channel_token = watch.resource_id = watch.expiration = None
+
+    async def _stop_channel(self, watch: Watch, channel_id: str, resource_id: Optional[str]) -> None:
+        try:
+            await execute_async(watch.drive_service.channels().stop(body={"id": channel_id, "resourceId": resource_id}))
+        except HttpError as e:
+            logger.info("Could not stop changes channel %s: %s", channel_id, e)
+
+    def _ensure_maintenance(self) -> None:
+        if self._maintenance is None or self._maintenance.done():
+            self._maintenance = asyncio.get_running_loop().create_task(self._maintenance_loop())
+
+    async def _maintenance_loop(self) -> None:
+        while self.watches:
+            await asyncio.sleep(settings.CHANGES_MAINTENANCE_INTERVAL)
+            try:
+                await self.maintain()
+            except Exception:
+                logger.exception("Changes maintenance pass failed")
+
+    def _spawn(self, coroutine) -> None:
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Changes sync failed", exc_info=task.exception())
+
+
+channel_manager = ChannelManager()
+
+
+router = APIRouter()
+
+@router.post("/drive/changes/watch")
+async def watch_changes(
+    drive_service=Depends(get_drive_service),
+    user_key: str = Depends(get_user_key)
+):
+    """
+    Start tracking Drive changes of the current user to keep the wrapper's caches fresh.
+    
+    Example input request:
+        POST /drive/changes/watch
+    
+    Google API request sent:
+        drive_service.changes().getStartPageToken()
+        drive_service.changes().watch(pageToken=start_page_token, body={
+            "id": "<uuid>", "type": "web_hook", "address": CHANGES_WEBHOOK_ADDRESS,
+            "token": "<secret>", "expiration": <ms>
+        })
+    """
+    try:
+        watch = await channel_manager.register(user_key, drive_service)
+        return watch.as_dict()
+    except HttpError as e:
+        raise HTTPException(status_code=e.resp.status, detail=str(e))
+
+@router.delete("/drive/changes/watch", status_code=status.HTTP_204_NO_CONTENT)
+async def stop_watching_changes(user_key: str = Depends(get_user_key)) -> None:
+    """
+    Stop tracking Drive changes of the current user.
+    
+    Google API request sent:
+        drive_service.channels().stop(body={"id": channel_id, "resourceId": resource_id})
+    """
+    await channel_manager.unregister(user_key)
+
+@router.post("/drive/changes/notifications", status_code=status.HTTP_204_NO_CONTENT)
+async def receive_change_notification(
+    channel_id: str = Header(..., alias="X-Goog-Channel-ID"),
+    resource_state: str = Header(..., alias="X-Goog-Resource-State"),
+    channel_token: Optional[str] = Header(None, alias="X-Goog-Channel-Token")
+) -> None:
+    """
+    Webhook receiver for Drive push notifications, the address to set as CHANGES_WEBHOOK_ADDRESS.
+    
+    The notification is acknowledged immediately; the changed files are then listed
+    in the background and invalidated in the folder, sheet and document caches.
+    
+    Example input request (sent by Google):
+        POST /drive/changes/notifications
+        X-Goog-Channel-ID: 01234567-89ab-cdef-0123456789ab
+        X-Goog-Channel-Token: <secret>
+        X-Goog-Resource-State: change
+    
+    Google API request sent:
+        drive_service.changes().list(pageToken=saved_page_token, pageSize=1000, includeRemoved=True,
+                                     fields="nextPageToken,newStartPageToken,changes(fileId,removed,file(parents))")
+    """
+    if not channel_manager.notify(channel_id, channel_token, resource_state):
+        raise HTTPException(status_code=404, detail="Unknown channel")
@@ -1,4 +1,4 @@
-from .models import CommentRequest, ReplyRequest
+from .models import CommentQueryRequest, CommentRequest, ReplyRequest
 from .router import router as comments_router
 
-__all__ = ["CommentRequest", "ReplyRequest", "comments_router"] 
\ No newline at end of file
+__all__ = ["CommentQueryRequest", "CommentRequest", "ReplyRequest", "comments_router"] 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 from pydantic.fields import Field
 
@@ -7,4 +7,11 @@ class CommentRequest(BaseModel):
     anchor: Optional[str] = Field(None, description="Custom anchor string for Google Docs")
 
 class ReplyRequest(BaseModel):
-    content: str 
\ No newline at end of file
+    content: str 
+
+class CommentQueryRequest(BaseModel):
+    fileIds: List[str] = Field(..., min_length=1, max_length=500, description="Files to fetch comments for")
+    startModifiedTime: Optional[str] = Field(None, description="Only comments modified at or after this RFC 3339 time")
+    includeDeleted: bool = Field(False, description="Include deleted comments")
+    pageSize: int = Field(100, ge=1, le=100, description="Comments per upstream page")
+    allPages: bool = Field(True, description="Follow nextPageToken until every comment is fetched")
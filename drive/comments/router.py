@@ -1,33 +1,127 @@
-from fastapi import APIRouter, Depends, Body, HTTPException
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, Body, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from googleapiclient.errors import HttpError
-from google_services import get_drive_service
-from .models import CommentRequest, ReplyRequest
+from starlette.concurrency import run_in_threadpool
+from config import settings
+from google_services import execute_isolated, get_drive_service
+from .models import CommentQueryRequest, CommentRequest, ReplyRequest
 
 router = APIRouter()
 
+COMMENT_FIELDS = "id,createdTime,modifiedTime,author,content,htmlContent,deleted,resolved,anchor,quotedFileContent"
+
+def fetch_comments(
+    drive_service,
+    file_id: str,
+    page_size: Optional[int] = None,
+    page_token: Optional[str] = None,
+    start_modified_time: Optional[str] = None,
+    include_deleted: bool = False,
+    all_pages: bool = False
+) -> dict:
+    """
+    Fetches comments of a file one page at a time, following nextPageToken if all_pages is set.
+    Safe to call from worker threads.
+    """
+    comments = []
+    while True:
+        result = execute_isolated(drive_service.comments().list(
+            fileId=file_id,
+            pageSize=page_size,
+            pageToken=page_token,
+            startModifiedTime=start_modified_time,
+            includeDeleted=include_deleted,
+            fields=f"nextPageToken,comments({COMMENT_FIELDS})"
+        ))
+        comments.extend(result.get("comments", []))
+        page_token = result.get("nextPageToken")
+        if not all_pages or not page_token:
+            break
+    response = {"comments": comments}
+    if page_token:
+        response["nextPageToken"] = page_token
+    return response
+
 @router.get("/drive/{file_id}/comment")
 async def list_comments(
     file_id: str,
+    pageSize: Optional[int] = Query(None, ge=1, le=100, description="Comments per page, Google's default is 20"),
+    pageToken: Optional[str] = Query(None, description="nextPageToken of the previous page"),
+    startModifiedTime: Optional[str] = Query(None, description="Only comments modified at or after this RFC 3339 time"),
+    includeDeleted: bool = Query(False, description="Include deleted comments"),
+    allPages: bool = Query(False, description="Follow nextPageToken and return every comment"),
     drive_service=Depends(get_drive_service)
 ):
     """
-    List all comments for a file.
+    List comments for a file, one page at a time or all pages with allPages=true.
     
     Example input request:
-        GET /drive/1a-28yTY23NuCa7vmyMABGgRDCErW58Q99F_2o9ZePGo/comment
+        GET /drive/1a-28yTY23NuCa7vmyMABGgRDCErW58Q99F_2o9ZePGo/comment?pageSize=100&startModifiedTime=2025-08-01T00:00:00Z
     
     Google API request sent:
-        drive_service.comments().list(fileId=file_id, fields="comments(id,createdTime,modifiedTime,author,content,htmlContent,deleted,resolved,anchor,quotedFileContent)")
+        drive_service.comments().list(fileId=file_id, pageSize=100, pageToken=None, startModifiedTime="2025-08-01T00:00:00Z", includeDeleted=False, fields="nextPageToken,comments(id,createdTime,modifiedTime,author,content,htmlContent,deleted,resolved,anchor,quotedFileContent)")
+        repeated with pageToken=nextPageToken while allPages is set
     """
     try:
-        comments = drive_service.comments().list(
-            fileId=file_id, 
-            fields="comments(id,createdTime,modifiedTime,author,content,htmlContent,deleted,resolved,anchor,quotedFileContent)"
-        ).execute()
-        return comments
+        return await run_in_threadpool(
+            fetch_comments, drive_service, file_id, pageSize, pageToken, startModifiedTime, includeDeleted, allPages
+        )
     except HttpError as e:
         raise HTTPException(status_code=e.resp.status, detail=str(e))
 
+@router.post("/drive/comments:query")
+async def query_comments(
+    req: CommentQueryRequest = Body(...),
+    drive_service=Depends(get_drive_service)
+):
+    """
+    Fetch the comments of many files concurrently, streamed as newline-delimited JSON.
+    
+    Files are fetched by at most COMMENTS_QUERY_CONCURRENCY workers and every file is
+    written out as soon as its comments are complete, in completion order. A failing
+    file produces an error line instead of failing the whole response.
+    
+    Example input request:
+        POST /drive/comments:query
+        Body: {
+            "fileIds": ["1a-28yTY23NuCa7vmyMABGgRDCErW58Q99F_2o9ZePGo", "1R3rJWb50oW2JNOqKd4l0XlP-9hdMPr1c9cxjYX3PWnY"],
+            "startModifiedTime": "2025-08-01T00:00:00Z"
+        }
+    
+    Example response lines:
+        {"fileId": "1a-28yTY23NuCa7vmyMABGgRDCErW58Q99F_2o9ZePGo", "comments": [...]}
+        {"fileId": "1R3rJWb50oW2JNOqKd4l0XlP-9hdMPr1c9cxjYX3PWnY", "error": {"status": 404, "message": "..."}}
+    
+    Google API request sent:
+        drive_service.comments().list(fileId=file_id, ...) per file and page, as for GET /drive/{file_id}/comment
+    """
+    semaphore = asyncio.Semaphore(settings.COMMENTS_QUERY_CONCURRENCY)
+
+    async def fetch(file_id: str) -> dict:
+        async with semaphore:
+            try:
+                result = await run_in_threadpool(
+                    fetch_comments, drive_service, file_id, req.pageSize, None,
+                    req.startModifiedTime, req.includeDeleted, req.allPages
+                )
+                return {"fileId": file_id, **result}
+            except HttpError as e:
+                return {"fileId": file_id, "error": {"status": e.resp.status, "message": str(e)}}
+
+    async def stream():
+        tasks = [asyncio.create_task(fetch(file_id)) for file_id in dict.fromkeys(req.fileIds)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield json.dumps(await task) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
 @router.get("/drive/{file_id}/comment/{comment_id}")
 async def get_comment(
     file_id: str,
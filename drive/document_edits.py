@@ -0,0 +1,238 @@
+import asyncio
+from typing import Dict, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from google_services import execute_async
+from .cache import invalidate_file
+
+
+class EditOperation(BaseModel):
+    type: Literal["insert", "delete", "replace"]
+    index: int = Field(..., ge=1, description="Start index, as left by the operations before this one")
+    endIndex: Optional[int] = Field(None, description="Exclusive end index for delete and replace")
+    text: Optional[str] = Field(None, description="Text to insert for insert and replace")
+
+
+class EditRequest(BaseModel):
+    operations: List[EditOperation]
+    revisionId: Optional[str] = Field(None, description="Revision the first operation's indices refer to")
+
+
+def utf16_len(text: str) -> int:
+    """Docs indices count UTF-16 code units."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def utf16_split(text: str, offset: int) -> Tuple[str, str]:
+    raw = text.encode("utf-16-le")
+    return raw[:offset * 2].decode("utf-16-le"), raw[offset * 2:].decode("utf-16-le")
+
+
+class EditComposer:
+    """
+    Composes a stream of sequential edits into non-overlapping replacements of the base revision.
+
+    The document is held as a piece table of ('base', start, end) spans of the base
+    revision and ('text', value) spans of inserted text. Applying edits splices the
+    table; adjacent inserted spans merge, so typing 'a', 'b', 'c' at consecutive
+    indices composes into a single insert of 'abc'. `requests()` rebases the result
+    onto base indices and orders it back to front, so each Docs request stays valid
+    after the ones before it have been applied.
+    """
+
+    def __init__(self):
+        # The trailing base span is open ended (end None) since the document length is unknown
+        self.segments: List[tuple] = [("base", 0, None)]
+
+    @staticmethod
+    def _length(segment: tuple) -> Optional[int]:
+        if segment[0] == "text":
+            return utf16_len(segment[1])
+        return None if segment[2] is None else segment[2] - segment[1]
+
+    def _split(self, index: int) -> int:
+        """Ensures a segment boundary at document `index` and returns the position of the segment starting there."""
+        pos = 0
+        for i, segment in enumerate(self.segments):
+            if pos == index:
+                return i
+            length = self._length(segment)
+            if length is None or index < pos + length:
+                offset = index - pos
+                if segment[0] == "text":
+                    head, tail = utf16_split(segment[1], offset)
+                    self.segments[i:i + 1] = [("text", head), ("text", tail)]
+                else:
+                    start, end = segment[1], segment[2]
+                    self.segments[i:i + 1] = [("base", start, start + offset), ("base", start + offset, end)]
+                return i + 1
+            pos += length
+        if pos == index:
+            return len(self.segments)
+        raise ValueError(f"Index {index} is beyond the end of the edited text")
+
+    def _normalize(self) -> None:
+        merged: List[tuple] = []
+        for segment in self.segments:
+            if self._length(segment) == 0:
+                continue
+            if merged and merged[-1][0] == segment[0] == "text":
+                merged[-1] = ("text", merged[-1][1] + segment[1])
+            elif merged and merged[-1][0] == segment[0] == "base" and merged[-1][2] == segment[1]:
+                merged[-1] = ("base", merged[-1][1], segment[2])
+            else:
+                merged.append(segment)
+        self.segments = merged
+
+    def insert(self, index: int, text: str) -> None:
+        if not text:
+            return
+        i = self._split(index)
+        self.segments.insert(i, ("text", text))
+        self._normalize()
+
+    def delete(self, index: int, end_index: int) -> None:
+        if end_index <= index:
+            raise ValueError(f"endIndex {end_index} must be greater than index {index}")
+        start = self._split(index)
+        end = self._split(end_index)
+        del self.segments[start:end]
+        self._normalize()
+
+    def apply(self, operations: List[EditOperation]) -> None:
+        """Applies all operations or, if one is invalid, none of them."""
+        snapshot = list(self.segments)
+        try:
+            for op in operations:
+                if op.type in ("delete", "replace"):
+                    if op.endIndex is None:
+                        raise ValueError(f"{op.type} at {op.index} requires endIndex")
+                    self.delete(op.index, op.endIndex)
+                if op.type in ("insert", "replace"):
+                    if op.text is None:
+                        raise ValueError(f"{op.type} at {op.index} requires text")
+                    self.insert(op.index, op.text)
+        except ValueError:
+            self.segments = snapshot
+            raise
+
+    def replacements(self) -> List[Tuple[int, int, str]]:
+        """Returns (startIndex, endIndex, text) replacements of base revision ranges, in index order."""
+        result = []
+        expected, text = 0, ""
+        for segment in self.segments:
+            if segment[0] == "text":
+                text += segment[1]
+                continue
+            if segment[1] != expected or text:
+                result.append((expected, segment[1], text))
+            expected, text = segment[2], ""
+        if text:
+            result.append((expected, expected, text))
+        return result
+
+    def requests(self) -> List[dict]:
+        """Docs batchUpdate requests, applied back to front so base indices stay valid."""
+        requests = []
+        for start, end, text in reversed(self.replacements()):
+            if end > start:
+                requests.append({"deleteContentRange": {"range": {"startIndex": start, "endIndex": end}}})
+            if text:
+                requests.append({"insertText": {"location": {"index": start}, "text": text}})
+        return requests
+
+
+class PendingEdits:
+    """Edits for one user and document collected during a flush window."""
+
+    def __init__(self, docs_service, document_id: str, revision_id: Optional[str], previous: Optional["PendingEdits"]):
+        self.docs_service = docs_service
+        self.document_id = document_id
+        self.revision_id = revision_id
+        self.previous = previous
+        self.composer = EditComposer()
+        self.closed = asyncio.Event()
+        self.future = asyncio.get_running_loop().create_future()
+        self.operations = 0
+        self.task: Optional[asyncio.Task] = None
+
+
+class EditCoalescer:
+    """
+    Buffers document edits per user and document for a short flush window and sends
+    everything that arrived in the window as a single `documents().batchUpdate`.
+
+    A submission carrying a different revisionId than the open window closes that
+    window early and starts a new one; windows of the same document are flushed in
+    arrival order. A window that waited on one with the same revisionId continues
+    from that window's edits, so it requires the revision that flush produced
+    rather than the client's, and fails if that flush failed.
+    """
+
+    def __init__(self):
+        self._pending: Dict[tuple, PendingEdits] = {}
+        self._last: Dict[tuple, PendingEdits] = {}
+
+    async def submit(self, key: tuple, docs_service, document_id: str, request: EditRequest, window: float) -> dict:
+        pending = self._pending.get(key)
+        if pending is not None and pending.revision_id != request.revisionId:
+            self._close(key, pending)
+            pending = None
+        if pending is None:
+            pending = PendingEdits(docs_service, document_id, request.revisionId, self._last.get(key))
+            pending.task = asyncio.create_task(self._flush(key, pending, window))
+            self._pending[key] = pending
+            self._last[key] = pending
+        pending.composer.apply(request.operations)
+        pending.operations += len(request.operations)
+        return await asyncio.shield(pending.future)
+
+    def _close(self, key: tuple, pending: PendingEdits) -> None:
+        if self._pending.get(key) is pending:
+            del self._pending[key]
+        pending.closed.set()
+
+    async def _flush(self, key: tuple, pending: PendingEdits, window: float) -> None:
+        try:
+            await asyncio.wait_for(pending.closed.wait(), timeout=window)
+        except asyncio.TimeoutError:
+            pass
+        self._close(key, pending)
+        try:
+            revision_id = await self._required_revision(pending)
+            requests = pending.composer.requests()
+            if requests:
+                body = {"requests": requests}
+                if revision_id:
+                    body["writeControl"] = {"requiredRevisionId": revision_id}
+                result = await execute_async(
+                    pending.docs_service.documents().batchUpdate(documentId=pending.document_id, body=body)
+                )
+                invalidate_file(pending.document_id)
+            else:
+                result = {"documentId": pending.document_id, "replies": []}
+                if revision_id:
+                    result["writeControl"] = {"requiredRevisionId": revision_id}
+            pending.future.set_result(result)
+        except Exception as e:
+            pending.future.set_exception(e)
+        finally:
+            if self._last.get(key) is pending:
+                del self._last[key]
+
+    async def _required_revision(self, pending: PendingEdits) -> Optional[str]:
+        """Waits for the previous window and returns the revision this window's edits apply to."""
+        previous = pending.previous
+        if previous is None:
+            return pending.revision_id
+        await asyncio.wait([previous.task])
+        if not pending.revision_id or previous.revision_id != pending.revision_id:
+            return pending.revision_id
+        error = previous.future.exception()
+        if error is not None:
+            raise error
+        return previous.future.result().get("writeControl", {}).get("requiredRevisionId", pending.revision_id)
+
+
+edit_coalescer = EditCoalescer()
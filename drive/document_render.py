@@ -0,0 +1,162 @@
+import re
+from typing import Iterator, List, Optional
+
+# Docs paragraph styles rendered as Markdown headings
+HEADING_LEVELS = {
+    "TITLE": 1,
+    "SUBTITLE": 2,
+    "HEADING_1": 1,
+    "HEADING_2": 2,
+    "HEADING_3": 3,
+    "HEADING_4": 4,
+    "HEADING_5": 5,
+    "HEADING_6": 6,
+}
+
+# List glyph types that make a nesting level numbered rather than bulleted
+ORDERED_GLYPHS = {"DECIMAL", "ZERO_DECIMAL", "UPPER_ALPHA", "ALPHA", "UPPER_ROMAN", "ROMAN"}
+
+_MARKDOWN_SPECIAL = re.compile(r"([\\`*_\[\]<>|])")
+# Text at the start of a line that Markdown would read as a heading, list item, rule or fence
+_BLOCK_MARKER = re.compile(
+    r"^\s*(?:(?P<marker>#{1,6}(?=\s|$)|[-+](?=\s|$)|-{3,}\s*$|~{3,})|(?P<number>\d{1,9})[.)](?=\s|$))"
+)
+
+
+def _element_text(element: dict) -> str:
+    """Plain text of a ParagraphElement."""
+    if "textRun" in element:
+        return element["textRun"].get("content", "")
+    if "autoText" in element:
+        return ""
+    if "person" in element:
+        return element["person"].get("personProperties", {}).get("name", "")
+    if "richLink" in element:
+        props = element["richLink"].get("richLinkProperties", {})
+        return props.get("title") or props.get("uri", "")
+    return ""
+
+
+def _cell_text(cell: dict) -> str:
+    return "".join(iter_text_content(cell.get("content", []))).strip("\n")
+
+
+def iter_text_content(content: List[dict]) -> Iterator[str]:
+    """Yields the plain text of a list of StructuralElements, one element at a time."""
+    for element in content:
+        if "paragraph" in element:
+            yield "".join(_element_text(e) for e in element["paragraph"].get("elements", []))
+        elif "table" in element:
+            for row in element["table"].get("tableRows", []):
+                yield "\t".join(_cell_text(c) for c in row.get("tableCells", [])) + "\n"
+        elif "tableOfContents" in element:
+            yield from iter_text_content(element["tableOfContents"].get("content", []))
+
+
+def iter_text(document: dict) -> Iterator[str]:
+    """Renders a Docs document body as plain text."""
+    return iter_text_content(document.get("body", {}).get("content", []))
+
+
+def _escape(text: str) -> str:
+    return _MARKDOWN_SPECIAL.sub(r"\\\1", text)
+
+
+def _escape_block_start(text: str) -> str:
+    """Escapes a leading block marker so a paragraph reading "1. item" or "# tag" stays as typed."""
+    match = _BLOCK_MARKER.match(text)
+    if not match:
+        return text
+    if match.group("number"):
+        return text[:match.end("number")] + "\\" + text[match.end("number"):]
+    return text[:match.start("marker")] + "\\" + text[match.start("marker"):]
+
+
+def _inline_markdown(element: dict) -> str:
+    if "textRun" not in element:
+        return _escape(_element_text(element))
+    run = element["textRun"]
+    content = run.get("content", "")
+    stripped = content.rstrip("\n")
+    trailing = content[len(stripped):]
+    text = stripped.strip()
+    if not text:
+        return content
+    leading_ws = stripped[:len(stripped) - len(stripped.lstrip())]
+    trailing_ws = stripped[len(stripped.rstrip()):]
+    style = run.get("textStyle", {})
+    text = _escape(text)
+    if style.get("bold"):
+        text = f"**{text}**"
+    if style.get("italic"):
+        text = f"*{text}*"
+    if style.get("strikethrough"):
+        text = f"~~{text}~~"
+    url = style.get("link", {}).get("url")
+    if url:
+        text = f"[{text}]({url})"
+    return f"{leading_ws}{text}{trailing_ws}{trailing}"
+
+
+def _paragraph_markdown(paragraph: dict) -> str:
+    return "".join(_inline_markdown(e) for e in paragraph.get("elements", [])).rstrip("\n")
+
+
+def _list_marker(document: dict, bullet: dict) -> str:
+    level = bullet.get("nestingLevel", 0)
+    props = document.get("lists", {}).get(bullet.get("listId"), {}).get("listProperties", {})
+    levels = props.get("nestingLevels", [])
+    glyph = levels[level].get("glyphType") if level < len(levels) else None
+    marker = "1." if glyph in ORDERED_GLYPHS else "-"
+    return f"{'  ' * level}{marker} "
+
+
+def _table_markdown(table: dict) -> Iterator[str]:
+    rows = table.get("tableRows", [])
+    for i, row in enumerate(rows):
+        cells = []
+        for cell in row.get("tableCells", []):
+            parts = [_paragraph_markdown(e["paragraph"]) for e in cell.get("content", []) if "paragraph" in e]
+            cells.append("<br>".join(p for p in parts if p))
+        yield "| " + " | ".join(cells) + " |\n"
+        if i == 0:
+            yield "|" + " --- |" * len(cells) + "\n"
+
+
+def iter_markdown_content(document: dict, content: List[dict]) -> Iterator[str]:
+    """Yields Markdown for a list of StructuralElements, one block at a time."""
+    previous: Optional[str] = None
+    for element in content:
+        if "paragraph" in element:
+            paragraph = element["paragraph"]
+            text = _escape_block_start(_paragraph_markdown(paragraph))
+            bullet = paragraph.get("bullet")
+            kind = "list" if bullet else "block"
+            if not text and not bullet:
+                continue
+            if previous and not (previous == "list" and kind == "list"):
+                yield "\n"
+            if bullet:
+                yield _list_marker(document, bullet) + text + "\n"
+            else:
+                level = HEADING_LEVELS.get(paragraph.get("paragraphStyle", {}).get("namedStyleType"))
+                yield ("#" * level + " " if level else "") + text + "\n"
+            previous = kind
+        elif "table" in element:
+            if previous:
+                yield "\n"
+            yield from _table_markdown(element["table"])
+            previous = "block"
+        elif "tableOfContents" in element:
+            yield from iter_markdown_content(document, element["tableOfContents"].get("content", []))
+
+
+def iter_markdown(document: dict) -> Iterator[str]:
+    """Renders a Docs document body as Markdown."""
+    return iter_markdown_content(document, document.get("body", {}).get("content", []))
+
+
+RENDERERS = {
+    "text": (iter_text, "text/plain; charset=utf-8"),
+    "markdown": (iter_markdown, "text/markdown; charset=utf-8"),
+}
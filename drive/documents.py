@@ -1,10 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from google_services import get_docs_service, get_drive_service
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query
+from fastapi.responses import Response, StreamingResponse
+from googleapiclient.errors import HttpError
+from google_services import execute_async, get_docs_service, get_drive_service, get_user_key
 from pydantic import BaseModel
-from typing import Optional
+from typing import Iterator, Optional
+from config import settings
+from .cache import TTLCache, invalidate_file
+from .document_edits import EditRequest, edit_coalescer
+from .document_render import RENDERERS
+from .responses import upstream_response
 
 router = APIRouter()
 
+# (document_id, format) -> (revisionId, rendered output); freshness is checked against revisionId
+render_cache = TTLCache("document_render", max_entries=64)
+
+# Rendered output is flushed to the client in chunks of roughly this many characters
+RENDER_CHUNK_SIZE = 64 * 1024
+
 # POST /drive/documents?parent=&title=: Create new empty document, with optional parent id parameter
 @router.post("/drive/documents")
 async def create_document(
@@ -54,7 +67,131 @@ async def get_document(document_id: str, docs_service=Depends(get_docs_service))
     """
     try:
         document = docs_service.documents().get(documentId=document_id).execute()
-        return document
+        return upstream_response(document)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def stream_rendered(document: dict, fmt: str) -> Iterator[str]:
+    """Renders the document element by element, flushing chunks as they fill and caching the result."""
+    render, _ = RENDERERS[fmt]
+    parts, buffer, size = [], [], 0
+    for piece in render(document):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= RENDER_CHUNK_SIZE:
+            chunk = "".join(buffer)
+            parts.append(chunk)
+            buffer, size = [], 0
+            yield chunk
+    chunk = "".join(buffer)
+    parts.append(chunk)
+    yield chunk
+    revision_id = document.get("revisionId")
+    if revision_id:
+        render_cache.set((document["documentId"], fmt), (revision_id, "".join(parts)), tags=(document["documentId"],))
+
+async def render_document(document_id: str, fmt: str, docs_service):
+    """
+    Serves a cached rendering if the document's revisionId is unchanged, otherwise
+    fetches the document and streams a fresh rendering.
+    """
+    _, media_type = RENDERERS[fmt]
+    cached = render_cache.get((document_id, fmt))
+    if cached:
+        revision = await execute_async(docs_service.documents().get(documentId=document_id, fields="revisionId"))
+        if revision.get("revisionId") == cached[0]:
+            return Response(cached[1], media_type=media_type)
+    document = await execute_async(docs_service.documents().get(documentId=document_id))
+    return StreamingResponse(stream_rendered(document, fmt), media_type=media_type)
+
+# GET /drive/documents/{document_id}/text: Return the document body as plain text
+@router.get("/drive/documents/{document_id}/text")
+async def get_document_text(document_id: str, docs_service=Depends(get_docs_service)):
+    """
+    Get the document body rendered as plain text.
+    
+    Example input request:
+        GET /drive/documents/1a-28yTY23NuCa7vmyMABGgRDCErW58Q99F_2o9ZePGo/text
+    
+    Google API request sent:
+        docs_service.documents().get(documentId=document_id, fields="revisionId") if a rendering is cached
+        docs_service.documents().get(documentId=document_id) otherwise, or if the revision changed
+    """
+    try:
+        return await render_document(document_id, "text", docs_service)
+    except HttpError as e:
+        raise HTTPException(status_code=e.resp.status, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# GET /drive/documents/{document_id}/markdown: Return the document body as Markdown
+@router.get("/drive/documents/{document_id}/markdown")
+async def get_document_markdown(document_id: str, docs_service=Depends(get_docs_service)):
+    """
+    Get the document body rendered as Markdown.
+    
+    Example input request:
+        GET /drive/documents/1a-28yTY23NuCa7vmyMABGgRDCErW58Q99F_2o9ZePGo/markdown
+    
+    Google API request sent:
+        docs_service.documents().get(documentId=document_id, fields="revisionId") if a rendering is cached
+        docs_service.documents().get(documentId=document_id) otherwise, or if the revision changed
+    """
+    try:
+        return await render_document(document_id, "markdown", docs_service)
+    except HttpError as e:
+        raise HTTPException(status_code=e.resp.status, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# POST /drive/documents/{document_id}/edits: Apply insert/delete/replace operations, coalesced per flush window
+@router.post("/drive/documents/{document_id}/edits")
+async def edit_document(
+    document_id: str,
+    req: EditRequest = Body(...),
+    docs_service=Depends(get_docs_service),
+    user_key: str = Depends(get_user_key)
+):
+    """
+    Apply text edits to a document.
+    
+    Operations are applied in order, each index referring to the document as left by
+    the operations before it. Edits arriving for the same document within the flush
+    window (DOCUMENT_EDIT_FLUSH_WINDOW) are composed: adjacent inserts and deletes are
+    merged and the result is rebased onto the indices of the original revision, so a
+    burst of keystroke-level edits is sent as a single batchUpdate. All callers of a
+    window receive the same batchUpdate response.
+    
+    Example input request:
+        POST /drive/documents/1a-28yTY23NuCa7vmyMABGgRDCErW58Q99F_2o9ZePGo/edits
+        Body: {
+            "revisionId": "ALm37BVt...",
+            "operations": [
+                {"type": "insert", "index": 10, "text": "Hel"},
+                {"type": "insert", "index": 13, "text": "lo"},
+                {"type": "replace", "index": 40, "endIndex": 45, "text": "world"}
+            ]
+        }
+    
+    Google API request sent:
+        {
+            "requests": [
+                {"deleteContentRange": {"range": {"startIndex": 35, "endIndex": 40}}},
+                {"insertText": {"location": {"index": 35}, "text": "world"}},
+                {"insertText": {"location": {"index": 10}, "text": "Hello"}}
+            ],
+            "writeControl": {"requiredRevisionId": "ALm37BVt..."}
+        }
+        (POST to docs_service.documents().batchUpdate)
+    """
+    try:
+        return await edit_coalescer.submit(
+            (user_key, document_id), docs_service, document_id, req, settings.DOCUMENT_EDIT_FLUSH_WINDOW
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HttpError as e:
+        raise HTTPException(status_code=e.resp.status, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -72,6 +209,7 @@ async def delete_document(document_id: str, drive_service=Depends(get_drive_serv
     """
     try:
         drive_service.files().delete(fileId=document_id).execute()
+        invalidate_file(document_id)
         return {"message": f"Document {document_id} deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
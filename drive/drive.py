@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from typing import Callable, List, Optional
 from pydantic import BaseModel
 from googleapiclient.errors import HttpError
 from pydantic.fields import Field
-from google_services import get_drive_service
+from google_services import get_credentials, get_drive_service, get_user_key_resolver
+from config import settings
+from . import prefetch
+from .cache import invalidate_file
+from .responses import FastJSONResponse
 
 router = APIRouter()
 
@@ -15,15 +20,29 @@ class DriveObject(BaseModel):
     parent_id: Optional[str] = Field(None, description="Parent ID of the file")
 
 
+def drive_object_dict(item: dict, parent_path: str = "") -> dict:
+    """Builds the DriveObject fields from Google Drive API item as a plain dict."""
+    name = item.get("name")
+    return {
+        "id": item.get("id"),
+        "name": name,
+        "mimeType": item.get("mimeType"),
+        "path": f"{parent_path}/{name}",
+        "parent_id": item.get("parents", [None])[0],
+    }
+
 def build_drive_object(item: dict, parent_path: str = "") -> DriveObject:
     """Builds a DriveObject from Google Drive API item."""
-    return DriveObject(
-        id=item.get("id"),
-        name=item.get("name"),
-        mimeType=item.get("mimeType"),
-        path=f"{parent_path}/{item.get('name')}" if parent_path else f"/{item.get('name')}",
-        parent_id=item.get("parents", [None])[0]
-    )
+    return DriveObject(**drive_object_dict(item, parent_path))
+
+def drive_objects_response(files: List[dict], parent_path: str = ""):
+    """
+    Returns the listing as DriveObject models, or with FAST_JSON enabled as an already
+    encoded response that skips model construction and response_model validation.
+    """
+    if settings.FAST_JSON:
+        return FastJSONResponse([drive_object_dict(f, parent_path) for f in files])
+    return [build_drive_object(f, parent_path) for f in files]
 
 @router.get("/drive/search", response_model=List[DriveObject])
 async def search_drive(
@@ -41,19 +60,44 @@ async def search_drive(
         query = " and ".join(q) if q else None
         results = drive_service.files().list(q=query, fields="files(id, name, mimeType, parents)").execute()
         files = results.get("files", [])
-        return [build_drive_object(f) for f in files]
+        return drive_objects_response(files)
     except HttpError as e:
         raise HTTPException(status_code=e.resp.status, detail=str(e))
 
 @router.get("/drive/navigate/{path:path}", response_model=List[DriveObject])
 async def list_drive_path(
     path: str,
+    background_tasks: BackgroundTasks,
     mimeType: Optional[str] = Query(None, description="Filter by mimeType"),
-    drive_service=Depends(get_drive_service)
+    prefetch_children: Optional[bool] = Query(
+        None, alias="prefetch", description="Prefetch child folder listings, defaults to PREFETCH_CHILD_FOLDERS"
+    ),
+    drive_service=Depends(get_drive_service),
+    resolve_user_key: Callable[[], str] = Depends(get_user_key_resolver)
 ) -> List[DriveObject]:
-    """List Google Drive content in a specific path with optional mimeType filter."""
+    """
+    List Google Drive content in a specific path with optional mimeType filter.
+
+    With prefetch enabled, the first page of every child folder is fetched in the background
+    after the response and kept for PREFETCH_TTL seconds, so navigating into one of them is
+    answered without a Google round trip.
+    """
+    if prefetch_children is None:
+        prefetch_children = settings.PREFETCH_CHILD_FOLDERS
     try:
         parts = [p for p in path.strip("/").split("/") if p]
+        requested_path = "".join(f"/{p}" for p in parts)
+        # The user key is only needed to read or fill the prefetch cache; resolving it may call Google
+        user_key = None
+        if prefetch_children or len(prefetch.folder_cache):
+            user_key = await run_in_threadpool(resolve_user_key)
+        # Prefetched listings are the unfiltered first page, so filtered navigations go to Google
+        use_cache = user_key is not None and parts and not mimeType
+        cached = prefetch.cached_listing(user_key, requested_path) if use_cache else None
+        if cached is not None:
+            if prefetch_children:
+                background_tasks.add_task(prefetch.schedule_prefetch, drive_service, user_key, requested_path, cached)
+            return drive_objects_response(cached, requested_path)
         parent_id = "root"
         parent_path = ""
         for part in parts:
@@ -69,10 +113,27 @@ async def list_drive_path(
             q += f" and mimeType='{mimeType}'"
         results = drive_service.files().list(q=q, fields="files(id, name, mimeType, parents)").execute()
         files = results.get("files", [])
-        return [build_drive_object(f, parent_path) for f in files]
+        if prefetch_children:
+            background_tasks.add_task(prefetch.schedule_prefetch, drive_service, user_key, parent_path, files)
+        return drive_objects_response(files, parent_path)
     except HttpError as e:
         raise HTTPException(status_code=e.resp.status, detail=str(e))
 
+@router.get("/drive/prefetch/stats")
+async def get_prefetch_stats(
+    reset: bool = Query(False, description="Reset the counters after reading"),
+    credentials=Depends(get_credentials)
+):
+    """Returns prefetch counters: listings prefetched, used and wasted, for tuning the budget.
+
+    The counters are process-wide, across all users; like every /drive route, reading
+    them requires a signed-in session.
+    """
+    result = prefetch.stats.as_dict()
+    if reset:
+        prefetch.stats.reset()
+    return result
+
 @router.delete("/drive/{id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_drive_object(
     id: str,
@@ -81,6 +142,7 @@ async def delete_drive_object(
     """Deletes an object by id from Google Drive."""
     try:
         drive_service.files().delete(fileId=id).execute()
+        invalidate_file(id)
     except HttpError as e:
         raise HTTPException(status_code=e.resp.status, detail=str(e))
 
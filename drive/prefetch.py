@@ -0,0 +1,130 @@
+import asyncio
+import json
+from collections import Counter
+from typing import Hashable, List, Optional, Set
+
+from googleapiclient.errors import HttpError
+
+from config import settings
+from google_services import execute_async
+from .cache import TTLCache
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+
+class PrefetchStats:
+    """Counters for tuning the prefetch budget: how many prefetched listings were used or wasted."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.prefetched = 0
+        self.bytes = 0
+        self.hits = 0
+        self.used = 0
+        self.wasted = 0
+        self.failed = 0
+        self.skipped_budget = 0
+
+    def as_dict(self) -> dict:
+        settled = self.used + self.wasted
+        return {
+            "prefetched": self.prefetched,
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "used": self.used,
+            "wasted": self.wasted,
+            "failed": self.failed,
+            "skipped_budget": self.skipped_budget,
+            "cached": len(folder_cache),
+            "hit_ratio": round(self.used / settled, 3) if settled else None,
+            "waste_ratio": round(self.wasted / settled, 3) if settled else None,
+        }
+
+
+stats = PrefetchStats()
+
+
+def _on_evict(key: Hashable, entry: dict, reason: str) -> None:
+    if not entry["used"] and reason != "removed":
+        stats.wasted += 1
+
+
+# (user_key, path) -> {"id": folder_id, "files": [...], "used": bool}
+folder_cache = TTLCache(
+    "folder_listing",
+    ttl=settings.PREFETCH_TTL,
+    max_entries=settings.PREFETCH_MAX_ENTRIES,
+    on_evict=_on_evict,
+)
+
+# Detached prefetch tasks, referenced so they are not garbage collected mid-flight
+_tasks: Set[asyncio.Task] = set()
+
+
+def cached_listing(user_key: str, path: str) -> Optional[List[dict]]:
+    """Returns the prefetched first page of `path` for this user, if still cached."""
+    entry = folder_cache.get((user_key, path))
+    if entry is None:
+        return None
+    stats.hits += 1
+    if not entry["used"]:
+        entry["used"] = True
+        stats.used += 1
+    return entry["files"]
+
+
+async def schedule_prefetch(drive_service, user_key: str, parent_path: str, files: List[dict]) -> None:
+    """
+    Starts prefetching the child folders of a listing. Run as a background task of the
+    navigate response, so it starts once the response is sent and returns immediately.
+    """
+    folders = [f for f in files if f.get("mimeType") == FOLDER_MIME_TYPE]
+    # Entries are keyed by path; a name shared by sibling folders does not identify one of them
+    names = Counter(f["name"] for f in folders)
+    folders = [f for f in folders if names[f["name"]] == 1]
+    if not folders:
+        return
+    task = asyncio.get_running_loop().create_task(prefetch_children(drive_service, user_key, parent_path, folders))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def prefetch_children(drive_service, user_key: str, parent_path: str, folders: List[dict]) -> None:
+    """
+    Fetches the first listing page of each child folder into the folder cache, with at
+    most PREFETCH_CONCURRENCY requests in flight and stopping once PREFETCH_MAX_FOLDERS
+    folders or PREFETCH_MAX_BYTES of listings have been fetched for this navigation.
+    """
+    semaphore = asyncio.Semaphore(settings.PREFETCH_CONCURRENCY)
+    budget = {"bytes": settings.PREFETCH_MAX_BYTES}
+    pending = [
+        f for f in folders
+        if (user_key, f"{parent_path}/{f['name']}") not in folder_cache
+    ]
+    stats.skipped_budget += max(0, len(pending) - settings.PREFETCH_MAX_FOLDERS)
+
+    async def fetch(folder: dict) -> None:
+        async with semaphore:
+            if budget["bytes"] <= 0:
+                stats.skipped_budget += 1
+                return
+            try:
+                result = await execute_async(drive_service.files().list(
+                    q=f"'{folder['id']}' in parents",
+                    fields="files(id, name, mimeType, parents)"
+                ))
+            except HttpError:
+                stats.failed += 1
+                return
+            files = result.get("files", [])
+            size = len(json.dumps(files))
+            budget["bytes"] -= size
+            stats.prefetched += 1
+            stats.bytes += size
+            tags = [folder["id"], *(f["id"] for f in files)]
+            path = f"{parent_path}/{folder['name']}"
+            folder_cache.set((user_key, path), {"id": folder["id"], "files": files, "used": False}, tags=tags)
+
+    await asyncio.gather(*(fetch(f) for f in pending[:settings.PREFETCH_MAX_FOLDERS]))
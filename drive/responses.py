@@ -0,0 +1,33 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from config import settings
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the stdlib encoder is used without it
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for trusted upstream payloads.
+
+    Returning a Response instance makes FastAPI skip `response_model` validation and
+    `jsonable_encoder`, so Google API dicts are encoded exactly once. Uses orjson when
+    installed, otherwise a compact stdlib encoding.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def upstream_response(payload: Any):
+    """Passes a Google API payload through FastJSONResponse when FAST_JSON is enabled."""
+    if settings.FAST_JSON:
+        return FastJSONResponse(payload)
+    return payload
@@ -0,0 +1,306 @@
+import re
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from config import settings
+from google_services import execute_async
+from .cache import TTLCache
+
+COLUMN_LETTERS = re.compile(r"^[A-Z]{1,3}$")
+
+
+class QueryPredicate(BaseModel):
+    column: str = Field(..., description="Header name, or column letter such as 'C'")
+    op: Literal["eq", "ne", "lt", "le", "gt", "ge", "in", "contains", "startswith", "empty", "not_empty"] = "eq"
+    value: Any = None
+
+
+class SheetQueryRequest(BaseModel):
+    where: List[QueryPredicate] = Field(default_factory=list, description="Predicates, all of which must match")
+    select: Optional[List[str]] = Field(None, description="Columns to return, all columns when omitted")
+    limit: Optional[int] = Field(None, ge=1, description="Stop reading once this many rows matched")
+    headerRow: bool = Field(True, description="Row 1 holds column names and is not matched")
+    windowRows: Optional[int] = Field(None, ge=1, le=10000, description="Rows read per values().get")
+    useIndex: bool = Field(False, description="Answer 'eq'/'in' predicates from a cached column index")
+
+
+def column_letter(index: int) -> str:
+    """Zero-based column index to its A1 letters."""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+def column_index(letters: str) -> int:
+    idx = 0
+    for c in letters:
+        idx = idx * 26 + (ord(c) - ord("A") + 1)
+    return idx - 1
+
+
+def resolve_column(column: str, header: Optional[List[str]]) -> int:
+    """Resolves a header name, or failing that column letters, to a zero-based index."""
+    if header and column in header:
+        return header.index(column)
+    if COLUMN_LETTERS.match(column):
+        return column_index(column)
+    raise ValueError(f"Unknown column '{column}'")
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def value_key(value: Any) -> Tuple[str, Any]:
+    """Equality key: numbers compare numerically ('5' == 5.0), everything else as text."""
+    number = _number(value)
+    if number is not None:
+        return ("n", number)
+    return ("s", "" if value is None else str(value))
+
+
+def compile_predicate(predicate: QueryPredicate) -> Callable[[str], bool]:
+    """Returns a test for one cell value; cells are the formatted strings values().get returns."""
+    op, value = predicate.op, predicate.value
+    if op in ("empty", "not_empty"):
+        wanted = op == "empty"
+        return lambda cell: (cell == "") == wanted
+    if op in ("eq", "ne"):
+        key = value_key(value)
+        if op == "eq":
+            return lambda cell: value_key(cell) == key
+        return lambda cell: value_key(cell) != key
+    if op == "in":
+        if not isinstance(value, list):
+            raise ValueError("'in' requires a list value")
+        keys = {value_key(v) for v in value}
+        return lambda cell: value_key(cell) in keys
+    if op in ("contains", "startswith"):
+        text = str(value).lower()
+        if op == "contains":
+            return lambda cell: text in cell.lower()
+        return lambda cell: cell.lower().startswith(text)
+    compare = {
+        "lt": lambda a, b: a < b,
+        "le": lambda a, b: a <= b,
+        "gt": lambda a, b: a > b,
+        "ge": lambda a, b: a >= b,
+    }[op]
+    number = _number(value)
+    if number is not None:
+        # Numeric bound: cells that are not numbers never match
+        def test(cell: str) -> bool:
+            cell_number = _number(cell)
+            return cell_number is not None and compare(cell_number, number)
+        return test
+    text = "" if value is None else str(value)
+    return lambda cell: cell != "" and compare(cell, text)
+
+
+def column_values(rows: List[list], index: int) -> List[str]:
+    """One column of a window; values().get drops trailing empty cells, so short rows are padded."""
+    return [str(row[index]) if index < len(row) else "" for row in rows]
+
+
+def evaluate_window(rows: List[list], predicates: List[Tuple[int, Callable[[str], bool]]]) -> List[int]:
+    """
+    Evaluates the predicates column by column over a window of rows and returns the
+    positions of the rows matching all of them. Each predicate only runs on the rows
+    still matching after the previous ones.
+    """
+    candidates = list(range(len(rows)))
+    for index, test in predicates:
+        if not candidates:
+            break
+        column = column_values([rows[i] for i in candidates], index)
+        candidates = [i for i, keep in zip(candidates, map(test, column)) if keep]
+    return candidates
+
+
+def consecutive_runs(rows: List[int]) -> List[Tuple[int, int]]:
+    """Groups sorted row numbers into (first, last) runs, one batchGet range each."""
+    runs: List[Tuple[int, int]] = []
+    for row in rows:
+        if runs and runs[-1][1] == row - 1:
+            runs[-1] = (runs[-1][0], row)
+        else:
+            runs.append((row, row))
+    return runs
+
+
+# (user_key, spreadsheet_id, sheet, column index or 'header') -> header row or {value_key: [row numbers]}
+index_cache = TTLCache(
+    "sheet_column_index",
+    ttl=settings.SHEET_QUERY_INDEX_TTL,
+    max_entries=settings.SHEET_QUERY_INDEX_MAX_ENTRIES,
+)
+
+
+class SheetQuery:
+    """
+    Evaluates a SheetQueryRequest against one sheet.
+
+    Rows are read in windows of `windowRows` with `values().get`, narrowed to the
+    columns the predicates and projection use, up to the sheet's grid row count.
+    Reading stops there or as soon as `limit` rows matched. A short window says
+    nothing about the end of the data: values().get drops trailing empty rows.
+    With `useIndex`, the first 'eq' or 'in' predicate is answered from a cached
+    value -> row numbers index of its column, and only the candidate rows are read
+    with `values().batchGet`.
+    """
+
+    def __init__(self, sheets_service, user_key: str, spreadsheet_id: str, sheet: str, request: SheetQueryRequest):
+        self.sheets_service = sheets_service
+        self.user_key = user_key
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet = sheet
+        self.request = request
+        self.window = request.windowRows or settings.SHEET_QUERY_WINDOW_ROWS
+        self.first_row = 2 if request.headerRow else 1
+        self.reads = 0
+
+    def _range(self, cells: str) -> str:
+        return "'{}'!{}".format(self.sheet.replace("'", "''"), cells)
+
+    async def _get(self, cells: str) -> List[list]:
+        self.reads += 1
+        result = await execute_async(self.sheets_service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id, range=self._range(cells)
+        ))
+        return result.get("values", [])
+
+    async def _header(self) -> Optional[List[str]]:
+        if not self.request.headerRow:
+            return None
+        if not self.request.useIndex:
+            rows = await self._get("1:1")
+            return [str(v) for v in rows[0]] if rows else []
+        key = (self.user_key, self.spreadsheet_id, self.sheet, "header")
+        header = index_cache.get(key)
+        if header is None:
+            rows = await self._get("1:1")
+            header = [str(v) for v in rows[0]] if rows else []
+            index_cache.set(key, header, tags=[self.spreadsheet_id])
+        return header
+
+    async def _row_count(self) -> int:
+        self.reads += 1
+        spreadsheet = await execute_async(self.sheets_service.spreadsheets().get(
+            spreadsheetId=self.spreadsheet_id, fields="sheets.properties"
+        ))
+        for sheet in spreadsheet.get("sheets", []):
+            if sheet["properties"]["title"] == self.sheet:
+                return sheet["properties"].get("gridProperties", {}).get("rowCount", 0)
+        raise LookupError(f"Sheet '{self.sheet}' not found.")
+
+    async def _column_index(self, column: int) -> Dict[tuple, List[int]]:
+        key = (self.user_key, self.spreadsheet_id, self.sheet, column)
+        index = index_cache.get(key)
+        if index is None:
+            letter = column_letter(column)
+            rows = await self._get(f"{letter}{self.first_row}:{letter}")
+            index = {}
+            for offset, row in enumerate(rows):
+                index.setdefault(value_key(row[0] if row else ""), []).append(self.first_row + offset)
+            index_cache.set(key, index, tags=[self.spreadsheet_id])
+        return index
+
+    async def run(self) -> dict:
+        # Resolving the sheet first turns an unknown sheet name into a LookupError, not a range error
+        row_count = await self._row_count()
+        header = await self._header()
+        predicates = [(resolve_column(p.column, header), compile_predicate(p)) for p in self.request.where]
+        if self.request.select:
+            selected = [resolve_column(c, header) for c in self.request.select]
+        else:
+            selected = None
+        columns_used = [index for index, _ in predicates] + (selected or [])
+        # Only the column span the query touches is read; without a projection, whole rows
+        span = (min(columns_used), max(columns_used)) if selected else None
+        if span:
+            predicates = [(index - span[0], test) for index, test in predicates]
+            projection = [index - span[0] for index in selected]
+        else:
+            projection = None
+
+        matches: List[Tuple[int, list]] = []
+        indexed = next(
+            (p for p in self.request.where if p.op in ("eq", "in")), None
+        ) if self.request.useIndex else None
+        if indexed is not None:
+            complete = await self._run_indexed(resolve_column(indexed.column, header), indexed, predicates, span, matches)
+        else:
+            complete = await self._run_scan(row_count, predicates, span, matches)
+
+        if projection is None:
+            names = header
+            rows = [row for _, row in matches]
+        else:
+            names = [header[i] if header and i < len(header) else column_letter(i) for i in selected]
+            rows = [[row[i] if i < len(row) else "" for i in projection] for _, row in matches]
+        return {
+            "columns": names,
+            "rows": rows,
+            "rowNumbers": [number for number, _ in matches],
+            "complete": complete,
+            "usedIndex": indexed is not None,
+            "reads": self.reads,
+        }
+
+    def _cells(self, start: int, end: Optional[int], span: Optional[Tuple[int, int]]) -> str:
+        end = "" if end is None else end
+        if span is None:
+            return f"{start}:{end}"
+        return f"{column_letter(span[0])}{start}:{column_letter(span[1])}{end}"
+
+    def _room(self, matches: list) -> Optional[int]:
+        return None if self.request.limit is None else self.request.limit - len(matches)
+
+    async def _run_scan(self, row_count: int, predicates, span, matches: list) -> bool:
+        """Reads window after window; returns False if it stopped at `limit` before the last row of the sheet."""
+        start = self.first_row
+        while start <= row_count:
+            end = min(start + self.window - 1, row_count)
+            rows = await self._get(self._cells(start, end, span))
+            # Trailing empty rows are left out of the response; they still take part in 'empty' predicates
+            rows.extend([] for _ in range(end - start + 1 - len(rows)))
+            for position in evaluate_window(rows, predicates):
+                matches.append((start + position, rows[position]))
+                if self._room(matches) == 0:
+                    return start + position == row_count
+            start = end + 1
+        return True
+
+    async def _run_indexed(self, column: int, predicate: QueryPredicate, predicates, span, matches: list) -> bool:
+        index = await self._column_index(column)
+        values = predicate.value if predicate.op == "in" else [predicate.value]
+        if not isinstance(values, list):
+            raise ValueError("'in' requires a list value")
+        candidates = sorted({row for value in values for row in index.get(value_key(value), [])})
+        # The remaining predicates, including the indexed one, are re-checked on the fetched rows
+        for offset in range(0, len(candidates), self.window):
+            chunk = candidates[offset:offset + self.window]
+            runs = consecutive_runs(chunk)
+            self.reads += 1
+            result = await execute_async(self.sheets_service.spreadsheets().values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=[self._range(self._cells(first, last, span)) for first, last in runs],
+            ))
+            rows = []
+            for (first, last), value_range in zip(runs, result.get("valueRanges", [])):
+                fetched = value_range.get("values", [])
+                rows.extend(fetched + [[] for _ in range(last - first + 1 - len(fetched))])
+            for position in evaluate_window(rows, predicates):
+                matches.append((chunk[position], rows[position]))
+                if self._room(matches) == 0:
+                    return offset + position == len(candidates) - 1
+        return True
@@ -0,0 +1,158 @@
+import asyncio
+import json
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from googleapiclient.errors import HttpError
+from pydantic import BaseModel, Field
+
+from config import settings
+from google_services import execute_async, get_slides_service, get_user_key
+from .cache import TTLCache
+from .responses import upstream_response
+
+router = APIRouter()
+
+# Enough to render a deck outline and request pages and thumbnails; page elements are left out
+PRESENTATION_FIELDS = "presentationId,title,revisionId,locale,pageSize,slides(objectId,slideProperties(layoutObjectId))"
+
+# (user_key, presentation_id, revisionId, page_id, size) -> thumbnail; a new revision misses the cache.
+# Thumbnail content URLs expire after 30 minutes, so entries must not outlive them.
+thumbnail_cache = TTLCache(
+    "slide_thumbnail",
+    ttl=settings.SLIDES_THUMBNAIL_TTL,
+    max_entries=settings.SLIDES_THUMBNAIL_MAX_ENTRIES,
+)
+
+
+class ThumbnailRequest(BaseModel):
+    pageIds: Optional[List[str]] = Field(None, description="Pages to render, all slides when omitted")
+    size: Literal["SMALL", "MEDIUM", "LARGE"] = "MEDIUM"
+
+# GET /drive/slides/{presentation_id}: Return presentation metadata and slide ids, without page contents
+@router.get("/drive/slides/{presentation_id}")
+async def get_presentation(
+    presentation_id: str,
+    fields: Optional[str] = Query(None, description="Field mask, defaults to metadata and slide ids"),
+    slides_service=Depends(get_slides_service)
+):
+    """
+    Get a presentation's metadata and slide ids. Pass `fields=*` for the whole presentation.
+
+    Example input request:
+        GET /drive/slides/17rCbrfnQiFBWqHQCOJ5U7bug05C5XF9c4o4ptRrrOHY
+
+    Google API request sent:
+        slides_service.presentations().get(
+            presentationId=presentation_id,
+            fields="presentationId,title,revisionId,locale,pageSize,slides(objectId,slideProperties(layoutObjectId))"
+        )
+    """
+    try:
+        presentation = await execute_async(slides_service.presentations().get(
+            presentationId=presentation_id, fields=fields or PRESENTATION_FIELDS
+        ))
+        return upstream_response(presentation)
+    except HttpError as e:
+        raise HTTPException(status_code=e.resp.status, detail=str(e))
+
+# GET /drive/slides/{presentation_id}/pages/{page_id}: Return a single page with its elements
+@router.get("/drive/slides/{presentation_id}/pages/{page_id}")
+async def get_presentation_page(
+    presentation_id: str,
+    page_id: str,
+    slides_service=Depends(get_slides_service)
+):
+    """
+    Get one page of a presentation, to load slides on demand instead of the whole deck.
+
+    Example input request:
+        GET /drive/slides/17rCbrfnQiFBWqHQCOJ5U7bug05C5XF9c4o4ptRrrOHY/pages/p
+
+    Google API request sent:
+        slides_service.presentations().pages().get(presentationId=presentation_id, pageObjectId=page_id)
+    """
+    try:
+        page = await execute_async(slides_service.presentations().pages().get(
+            presentationId=presentation_id, pageObjectId=page_id
+        ))
+        return upstream_response(page)
+    except HttpError as e:
+        raise HTTPException(status_code=e.resp.status, detail=str(e))
+
+# POST /drive/slides/{presentation_id}/thumbnails: Stream page thumbnails as newline-delimited JSON
+@router.post("/drive/slides/{presentation_id}/thumbnails")
+async def get_thumbnails(
+    presentation_id: str,
+    req: ThumbnailRequest = Body(ThumbnailRequest()),
+    slides_service=Depends(get_slides_service),
+    user_key: str = Depends(get_user_key)
+):
+    """
+    Fetch thumbnails of many pages concurrently, streamed as newline-delimited JSON.
+
+    Thumbnails cached for the current revision are written first; the rest are fetched
+    by at most SLIDES_THUMBNAIL_CONCURRENCY workers and written in completion order, so
+    a large deck fills in progressively. A failing page produces an error line instead
+    of failing the whole response.
+
+    Example input request:
+        POST /drive/slides/17rCbrfnQiFBWqHQCOJ5U7bug05C5XF9c4o4ptRrrOHY/thumbnails
+        Body: {"pageIds": ["p", "g1"], "size": "SMALL"}
+
+    Example response lines:
+        {"pageId": "p", "contentUrl": "https://lh7-us.googleusercontent.com/...", "width": 200, "height": 113}
+        {"pageId": "g1", "error": {"status": 404, "message": "..."}}
+
+    Google API request sent:
+        slides_service.presentations().get(presentationId=presentation_id, fields="revisionId,slides(objectId)")
+        slides_service.presentations().pages().getThumbnail(
+            presentationId=presentation_id, pageObjectId=page_id, thumbnailProperties_thumbnailSize="SMALL"
+        ) per page not cached for the current revision
+    """
+    try:
+        presentation = await execute_async(slides_service.presentations().get(
+            presentationId=presentation_id, fields="revisionId,slides(objectId)"
+        ))
+    except HttpError as e:
+        raise HTTPException(status_code=e.resp.status, detail=str(e))
+    revision_id = presentation.get("revisionId")
+    page_ids = req.pageIds or [s["objectId"] for s in presentation.get("slides", [])]
+    semaphore = asyncio.Semaphore(settings.SLIDES_THUMBNAIL_CONCURRENCY)
+
+    def cache_key(page_id: str) -> tuple:
+        return (user_key, presentation_id, revision_id, page_id, req.size)
+
+    async def fetch(page_id: str) -> dict:
+        async with semaphore:
+            try:
+                thumbnail = await execute_async(slides_service.presentations().pages().getThumbnail(
+                    presentationId=presentation_id,
+                    pageObjectId=page_id,
+                    thumbnailProperties_thumbnailSize=req.size
+                ))
+            except HttpError as e:
+                return {"pageId": page_id, "error": {"status": e.resp.status, "message": str(e)}}
+        result = {"pageId": page_id, **thumbnail}
+        if revision_id:
+            thumbnail_cache.set(cache_key(page_id), result, tags=[presentation_id])
+        return result
+
+    async def stream():
+        missing = []
+        for page_id in dict.fromkeys(page_ids):
+            cached = thumbnail_cache.get(cache_key(page_id)) if revision_id else None
+            if cached is not None:
+                yield json.dumps(cached) + "\n"
+            else:
+                missing.append(page_id)
+        tasks = [asyncio.create_task(fetch(page_id)) for page_id in missing]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield json.dumps(await task) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -1,7 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
-from google_services import get_sheets_service
+from googleapiclient.errors import HttpError
+from google_services import get_sheets_service, get_user_key
 from pydantic import BaseModel
 from typing import Any, Optional, Dict
+from .cache import invalidate_file
+from .responses import upstream_response
+from .sheet_query import SheetQuery, SheetQueryRequest
 
 router = APIRouter()
 
@@ -48,7 +52,7 @@ async def get_spreadsheet(spreadsheet_id: str, sheets_service=Depends(get_sheets
     """
     try:
         spreadsheet = sheets_service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-        return spreadsheet
+        return upstream_response(spreadsheet)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -66,6 +70,7 @@ async def delete_spreadsheet(spreadsheet_id: str, sheets_service=Depends(get_she
     """
     try:
         sheets_service.spreadsheets().delete(spreadsheetId=spreadsheet_id).execute()
+        invalidate_file(spreadsheet_id)
         return {"message": f"Spreadsheet {spreadsheet_id} deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -117,7 +122,7 @@ async def get_sheet(spreadsheet_id: str, name: str, sheets_service=Depends(get_s
         sheets = spreadsheet.get("sheets", [])
         for sheet in sheets:
             if sheet["properties"]["title"] == name:
-                return sheet
+                return upstream_response(sheet)
         raise HTTPException(status_code=404, detail=f"Sheet '{name}' not found.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -157,7 +162,45 @@ async def get_sheet_range(
         result = sheets_service.spreadsheets().values().get(
             spreadsheetId=spreadsheet_id, range=full_range
         ).execute()
-        return result
+        return upstream_response(result)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# POST /drive/spreadsheets/{spreadsheet_id}/sheets/{name}/query: Returns the rows matching column predicates, read in row windows
+@router.post("/drive/spreadsheets/{spreadsheet_id}/sheets/{name}/query")
+async def query_sheet(
+    spreadsheet_id: str,
+    name: str,
+    req: SheetQueryRequest = Body(...),
+    sheets_service=Depends(get_sheets_service),
+    user_key: str = Depends(get_user_key)
+):
+    """
+    Get the rows of a sheet matching all predicates, projected to the selected columns.
+    
+    Example input request:
+        POST /drive/spreadsheets/1R3rJWb50oW2JNOqKd4l0XlP-9hdMPr1c9cxjYX3PWnY/sheets/Sheet1/query
+        Body: {"where": [{"column": "status", "op": "eq", "value": "open"}], "select": ["id", "status"], "limit": 50}
+    
+    Google API request sent:
+        sheets_service.spreadsheets().get(spreadsheetId=spreadsheet_id, fields="sheets.properties")
+        sheets_service.spreadsheets().values().get(spreadsheetId=spreadsheet_id, range="'Sheet1'!1:1")
+        sheets_service.spreadsheets().values().get(spreadsheetId=spreadsheet_id, range="'Sheet1'!A2:B1001")
+        ... next windows of 1000 rows until 50 rows matched or the sheet's rowCount is reached
+        
+        With "useIndex": true, the indexed column once, then only the candidate rows:
+        sheets_service.spreadsheets().values().get(spreadsheetId=spreadsheet_id, range="'Sheet1'!B2:B")
+        sheets_service.spreadsheets().values().batchGet(spreadsheetId=spreadsheet_id, ranges=["'Sheet1'!A2:B2", ...])
+    """
+    try:
+        result = await SheetQuery(sheets_service, user_key, spreadsheet_id, name, req).run()
+        return upstream_response(result)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HttpError as e:
+        raise HTTPException(status_code=e.resp.status, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -190,6 +233,7 @@ async def delete_sheet(spreadsheet_id: str, name: str, sheets_service=Depends(ge
             raise HTTPException(status_code=404, detail=f"Sheet '{name}' not found.")
         body = {"requests": [{"deleteSheet": {"sheetId": sheet_id}}]}
         result = sheets_service.spreadsheets().batchUpdate(spreadsheetId=spreadsheet_id, body=body).execute()
+        invalidate_file(spreadsheet_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -245,6 +289,7 @@ async def delete_range(
             ]
         }
         result = sheets_service.spreadsheets().batchUpdate(spreadsheetId=spreadsheet_id, body=body).execute()
+        invalidate_file(spreadsheet_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -362,6 +407,7 @@ async def update_sheet_range(
             raise HTTPException(status_code=400, detail="No values or format provided.")
         body = {"requests": requests}
         result = sheets_service.spreadsheets().batchUpdate(spreadsheetId=spreadsheet_id, body=body).execute()
+        invalidate_file(spreadsheet_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,7 +1,13 @@
+import hashlib
+from typing import Callable, Optional
 from fastapi import Depends, HTTPException, Request
+from google.auth import jwt
 from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request as GoogleRequest
+from google.auth.transport.requests import AuthorizedSession, Request as GoogleRequest
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
+from googleapiclient.http import build_http
+from starlette.concurrency import run_in_threadpool
 
 def get_credentials(request: Request) -> Credentials:
     if 'credentials' not in request.session:
@@ -23,6 +29,33 @@ def get_credentials(request: Request) -> Credentials:
 
     return credentials
 
+USERINFO_URL = "https://openidconnect.googleapis.com/v1/userinfo"
+
+def fetch_user_id(credentials: Credentials, id_token: Optional[str] = None) -> str:
+    """Google account id ('sub') of the signed-in user, the same across tokens and logins."""
+    if id_token:
+        # Received directly from Google's token endpoint over TLS, so the signature need not be verified
+        return jwt.decode(id_token, verify=False)["sub"]
+    response = AuthorizedSession(credentials).get(USERINFO_URL)
+    response.raise_for_status()
+    return response.json()["sub"]
+
+def get_user_key(request: Request, credentials: Credentials = Depends(get_credentials)) -> str:
+    """Stable, non-reversible key identifying the signed-in user for in-memory state."""
+    user_id = request.session.get('user_id')
+    if user_id is None:
+        # Sessions created before /callback stored the account id
+        try:
+            user_id = fetch_user_id(credentials)
+        except Exception as e:
+            raise HTTPException(status_code=401, detail=f"Could not identify the signed-in user: {e}")
+        request.session['user_id'] = user_id
+    return hashlib.sha256(user_id.encode()).hexdigest()[:32]
+
+def get_user_key_resolver(request: Request, credentials: Credentials = Depends(get_credentials)) -> Callable[[], str]:
+    """For endpoints that only sometimes need the user key: resolves it when called, not per request."""
+    return lambda: get_user_key(request, credentials)
+
 def get_drive_service(credentials: Credentials = Depends(get_credentials)):
     return build('drive', 'v3', credentials=credentials)
 
@@ -33,4 +66,20 @@ def get_sheets_service(credentials: Credentials = Depends(get_credentials)):
     return build('sheets', 'v4', credentials=credentials)
 
 def get_slides_service(credentials: Credentials = Depends(get_credentials)):
-    return build('slides', 'v1', credentials=credentials) 
\ No newline at end of file
+    return build('slides', 'v1', credentials=credentials)
+
+def execute_isolated(request):
+    """
+    Executes a googleapiclient request on its own HTTP connection.
+
+    httplib2 connections are not thread-safe, so requests executed from worker
+    threads must not share the service's connection.
+    """
+    http = request.http
+    if isinstance(http, AuthorizedHttp):
+        http = AuthorizedHttp(http.credentials, http=build_http())
+    return request.execute(http=http)
+
+async def execute_async(request):
+    """Executes a googleapiclient request in the threadpool without blocking the event loop."""
+    return await run_in_threadpool(execute_isolated, request)
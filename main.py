@@ -2,7 +2,7 @@ from fastapi import FastAPI
 from starlette.middleware.sessions import SessionMiddleware
 from config import settings
 from auth import router as auth_router
-from drive import drive_router, spreadsheets_router, documents_router, comments_router
+from drive import drive_router, spreadsheets_router, documents_router, comments_router, changes_router, slides_router
 import uvicorn
 import os
 
@@ -17,6 +17,8 @@ app.include_router(drive_router)
 app.include_router(spreadsheets_router)
 app.include_router(documents_router)
 app.include_router(comments_router)
+app.include_router(changes_router)
+app.include_router(slides_router)
 
 @app.get("/")
 async def read_root():
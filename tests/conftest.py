@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The app modules read these through config.Settings at import time
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("HOST", "localhost")
+os.environ.setdefault("PORT", "8000")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,22 @@
+import asyncio
+
+from bench.dataset import Dataset
+from bench.fake_google import FakeGoogleBackend
+from config import settings
+from drive.changes import ChannelManager
+
+
+def test_concurrent_watch_calls_open_one_channel(monkeypatch):
+    monkeypatch.setattr(settings, "CHANGES_WEBHOOK_ADDRESS", "https://wrapper.bench.invalid/drive/changes/notifications")
+    backend = FakeGoogleBackend(Dataset(), latency=0.05)
+    drive_service = backend.build("drive", "v3")
+    manager = ChannelManager()
+
+    async def run():
+        return await asyncio.gather(*(manager.register("user", drive_service) for _ in range(3)))
+
+    watches = asyncio.run(run())
+    assert all(watch is watches[0] for watch in watches)
+    assert backend.calls["drive.changes.getStartPageToken"] == 1
+    assert backend.calls["drive.changes.watch"] == 1
+    assert list(backend.channels) == [watches[0].channel_id]
@@ -0,0 +1,150 @@
+import asyncio
+import random
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from bench.dataset import Dataset, build_document
+from bench.fake_google import FakeGoogleBackend
+from drive.document_edits import EditCoalescer, EditComposer, EditOperation, EditRequest
+
+
+def insert(index, text):
+    return EditOperation(type="insert", index=index, text=text)
+
+
+def delete(index, end_index):
+    return EditOperation(type="delete", index=index, endIndex=end_index)
+
+
+def replace(index, end_index, text):
+    return EditOperation(type="replace", index=index, endIndex=end_index, text=text)
+
+
+def apply_sequentially(text, operations):
+    """Reference model: each operation applied to the string as left by the previous ones."""
+    for op in operations:
+        if op.type in ("delete", "replace"):
+            text = text[:op.index] + text[op.endIndex:]
+        if op.type in ("insert", "replace"):
+            text = text[:op.index] + op.text + text[op.index:]
+    return text
+
+
+def apply_requests(text, requests):
+    """Applies Docs batchUpdate requests in order, as Google does."""
+    for request in requests:
+        if "deleteContentRange" in request:
+            r = request["deleteContentRange"]["range"]
+            text = text[:r["startIndex"]] + text[r["endIndex"]:]
+        else:
+            index = request["insertText"]["location"]["index"]
+            text = text[:index] + request["insertText"]["text"] + text[index:]
+    return text
+
+
+def compose(operations):
+    composer = EditComposer()
+    composer.apply(operations)
+    return composer.requests()
+
+
+def test_consecutive_keystrokes_merge_into_one_insert():
+    requests = compose([insert(1, "a"), insert(2, "b"), insert(3, "c")])
+    assert requests == [{"insertText": {"location": {"index": 1}, "text": "abc"}}]
+
+
+def test_typing_then_backspace_cancels_out():
+    assert compose([insert(5, "ab"), delete(6, 7), delete(5, 6)]) == []
+
+
+def test_consecutive_deletes_merge_into_one_range():
+    requests = compose([delete(10, 11), delete(9, 10), delete(8, 9)])
+    assert requests == [{"deleteContentRange": {"range": {"startIndex": 8, "endIndex": 11}}}]
+
+
+def test_requests_are_ordered_back_to_front_on_base_indices():
+    # Later indices already count the characters inserted before them: 13 is base 10, 20:22 is base 16:18
+    requests = compose([insert(2, "abc"), insert(13, "x"), replace(20, 22, "yz")])
+    assert [r.get("insertText", r.get("deleteContentRange")) for r in requests] == [
+        {"range": {"startIndex": 16, "endIndex": 18}},
+        {"location": {"index": 16}, "text": "yz"},
+        {"location": {"index": 10}, "text": "x"},
+        {"location": {"index": 2}, "text": "abc"},
+    ]
+
+
+def test_indices_count_utf16_code_units():
+    # The emoji is a surrogate pair, two Docs index units
+    requests = compose([insert(1, "\U0001F600"), insert(3, "a")])
+    assert requests == [{"insertText": {"location": {"index": 1}, "text": "\U0001F600a"}}]
+
+
+def test_invalid_operation_rolls_back_the_whole_submission():
+    composer = EditComposer()
+    composer.apply([insert(1, "a")])
+    before = list(composer.segments)
+    with pytest.raises(ValueError):
+        composer.apply([insert(2, "b"), delete(5, 5)])
+    assert composer.segments == before
+    with pytest.raises(ValueError):
+        composer.apply([EditOperation(type="replace", index=1, text="x")])
+    assert composer.segments == before
+
+
+def test_random_sequences_match_sequential_application():
+    rng = random.Random(7)
+    alphabet = "abcdefgh"
+    for _ in range(500):
+        base = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 40)))
+        text = base
+        operations = []
+        for _ in range(rng.randint(1, 12)):
+            kind = rng.choice(["insert", "delete", "replace"])
+            if kind == "insert" or len(text) < 2:
+                index = rng.randint(1, len(text))
+                op = insert(index, "".join(rng.choice("XYZ") for _ in range(rng.randint(1, 3))))
+            else:
+                index = rng.randint(1, len(text) - 1)
+                end = rng.randint(index + 1, len(text))
+                if kind == "delete":
+                    op = delete(index, end)
+                else:
+                    op = replace(index, end, "".join(rng.choice("XYZ") for _ in range(rng.randint(1, 3))))
+            operations.append(op)
+            text = apply_sequentially(text, [op])
+        assert apply_requests(base, compose(operations)) == text
+
+
+def submit_two_windows(first_revision, second_revision):
+    """Two windows of one user and document, the second opened while the first's batchUpdate is in flight."""
+    dataset = Dataset()
+    document_id = build_document(dataset, 5, random.Random(1))
+    # Upstream latency longer than the flush window keeps the first flush in flight
+    docs_service = FakeGoogleBackend(dataset, latency=0.15).build("docs", "v1")
+    coalescer = EditCoalescer()
+    key = ("user", document_id)
+
+    async def run():
+        first = asyncio.create_task(coalescer.submit(
+            key, docs_service, document_id, EditRequest(operations=[insert(1, "a")], revisionId=first_revision), 0.1
+        ))
+        await asyncio.sleep(0.2)
+        second = asyncio.create_task(coalescer.submit(
+            key, docs_service, document_id, EditRequest(operations=[insert(2, "b")], revisionId=second_revision), 0.1
+        ))
+        return await asyncio.gather(first, second, return_exceptions=True)
+
+    return asyncio.run(run())
+
+
+def test_window_chained_on_the_same_revision_requires_the_revision_its_predecessor_produced():
+    first, second = submit_two_windows("rev-1", "rev-1")
+    assert first["writeControl"]["requiredRevisionId"] == "rev-2"
+    assert second["writeControl"]["requiredRevisionId"] == "rev-3"
+
+
+def test_window_chained_on_a_failed_window_with_the_same_revision_fails():
+    first, second = submit_two_windows("rev-9", "rev-9")
+    assert isinstance(first, HttpError) and first.resp.status == 400
+    assert second is first
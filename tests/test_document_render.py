@@ -0,0 +1,40 @@
+import pytest
+
+from drive.document_render import iter_markdown
+
+
+def paragraph(text, style="NORMAL_TEXT", bullet=None):
+    body = {"elements": [{"textRun": {"content": text + "\n"}}], "paragraphStyle": {"namedStyleType": style}}
+    if bullet is not None:
+        body["bullet"] = bullet
+    return {"paragraph": body}
+
+
+def render(*content, lists=None):
+    return "".join(iter_markdown({"body": {"content": list(content)}, "lists": lists or {}}))
+
+
+@pytest.mark.parametrize("text, markdown", [
+    ("# not a heading", "\\# not a heading"),
+    ("- not a bullet", "\\- not a bullet"),
+    ("+ not a bullet", "\\+ not a bullet"),
+    ("> not a quote", "\\> not a quote"),
+    ("1. not numbered", "1\\. not numbered"),
+    ("2) not numbered", "2\\) not numbered"),
+    ("---", "\\---"),
+    ("~~~", "\\~~~"),
+    ("#hashtag", "#hashtag"),
+    ("-5 degrees", "-5 degrees"),
+    ("2.5 liters", "2.5 liters"),
+])
+def test_leading_block_markers_in_plain_paragraphs_are_escaped(text, markdown):
+    assert render(paragraph(text)) == markdown + "\n"
+
+
+def test_headings_and_bullets_keep_their_own_markers():
+    lists = {"l": {"listProperties": {"nestingLevels": [{"glyphType": "DECIMAL"}]}}}
+    content = [
+        paragraph("Title", style="HEADING_2"),
+        paragraph("- dash item", bullet={"listId": "l"}),
+    ]
+    assert render(*content, lists=lists) == "## Title\n\n1. \\- dash item\n"
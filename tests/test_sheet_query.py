@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from bench.dataset import Dataset, SPREADSHEET_MIME
+from bench.fake_google import FakeGoogleBackend
+from drive.sheet_query import (
+    QueryPredicate,
+    SheetQuery,
+    SheetQueryRequest,
+    compile_predicate,
+    evaluate_window,
+)
+
+
+def where(column, op="eq", value=None):
+    return QueryPredicate(column=column, op=op, value=value)
+
+
+def make_sheet(values, row_count):
+    """A spreadsheet whose 'Sheet1' holds `values` in a grid of `row_count` rows."""
+    dataset = Dataset()
+    spreadsheet_id = dataset.add_file("Query Sheet", SPREADSHEET_MIME)["id"]
+    dataset.values[spreadsheet_id] = {"Sheet1": values}
+    dataset.spreadsheets[spreadsheet_id] = {
+        "spreadsheetId": spreadsheet_id,
+        "sheets": [{"properties": {"sheetId": 0, "title": "Sheet1", "gridProperties": {"rowCount": row_count}}}],
+    }
+    return FakeGoogleBackend(dataset).build("sheets", "v4"), spreadsheet_id
+
+
+def run_query(values, row_count, sheet="Sheet1", **request):
+    sheets_service, spreadsheet_id = make_sheet(values, row_count)
+    query = SheetQuery(sheets_service, "user", spreadsheet_id, sheet, SheetQueryRequest(**request))
+    return asyncio.run(query.run())
+
+
+HEADER = ["id", "status", "owner", "score"]
+ROWS = [
+    HEADER,
+    ["1", "open", "ann", "5"],
+    ["2", "closed", "bob", "12"],
+    ["3", "open", "", "7.0"],
+    ["4", "open", "cy"],
+]
+
+
+def test_predicates_compare_numbers_numerically_and_text_as_text():
+    assert compile_predicate(where("A", "eq", 5))("5.0")
+    assert not compile_predicate(where("A", "eq", "5"))("five")
+    assert compile_predicate(where("A", "in", [1, "x"]))("x")
+    assert compile_predicate(where("A", "gt", 10))("12")
+    assert not compile_predicate(where("A", "gt", 10))("abc")
+    assert compile_predicate(where("A", "lt", "m"))("bob")
+    assert not compile_predicate(where("A", "lt", "m"))("")
+    assert compile_predicate(where("A", "contains", "PE"))("open")
+    assert compile_predicate(where("A", "empty"))("")
+    with pytest.raises(ValueError):
+        compile_predicate(where("A", "in", "x"))
+
+
+def test_evaluate_window_pads_short_rows_and_narrows_candidates():
+    rows = [["1", "open"], ["2"], [], ["4", "open"]]
+    predicates = [
+        (1, compile_predicate(where("B", "empty"))),
+        (0, compile_predicate(where("A", "ge", 2))),
+    ]
+    assert evaluate_window(rows, predicates) == [1]
+
+
+def test_scan_matches_trailing_blank_rows_up_to_the_row_count():
+    result = run_query(ROWS, row_count=8, where=[where("status", "empty")], windowRows=3)
+    assert result["rowNumbers"] == [6, 7, 8]
+    assert result["complete"] is True
+    # spreadsheets().get, the header, then windows 2-4, 5-7 and 8-8
+    assert result["reads"] == 5
+
+
+def test_scan_stopping_at_limit_on_the_last_row_is_complete():
+    result = run_query(ROWS, row_count=5, where=[where("status", "eq", "open")], limit=3, windowRows=2)
+    assert result["rowNumbers"] == [2, 4, 5]
+    assert result["complete"] is True
+
+
+def test_scan_stopping_at_limit_before_the_last_row_is_incomplete():
+    result = run_query(ROWS, row_count=5, where=[where("status", "eq", "open")], limit=2)
+    assert result["rowNumbers"] == [2, 4]
+    assert result["complete"] is False
+
+
+def test_projection_span_not_starting_at_column_a():
+    result = run_query(ROWS, row_count=5, where=[where("score", "ge", 7)], select=["owner", "score"])
+    assert result["columns"] == ["owner", "score"]
+    assert result["rows"] == [["bob", "12"], ["", "7.0"]]
+    assert result["rowNumbers"] == [3, 4]
+
+
+def test_unknown_sheet_raises_lookup_error_before_reading_values():
+    sheets_service, spreadsheet_id = make_sheet(ROWS, row_count=5)
+    query = SheetQuery(sheets_service, "user", spreadsheet_id, "Missing", SheetQueryRequest(where=[where("id")]))
+    with pytest.raises(LookupError):
+        asyncio.run(query.run())
+    assert query.reads == 1